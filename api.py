@@ -0,0 +1,229 @@
+"""JSON projection API for other tools.
+
+    python api.py [--host 127.0.0.1] [--port 8000]
+
+A plain ASGI application (``api:app``), so any ASGI server can host it; when
+run directly it uses uvicorn if installed and otherwise a small built-in
+asyncio HTTP/1.1 server.
+
+    GET  /health
+    POST /projection   {...params...} | [{...}, ...] | {"scenarios": [...], "summary": true}
+
+Params are ``ProjectionParams`` fields in the same units (deterioration,
+subscription increase, ramp-up and post-cleaning saving as fractions);
+missing fields take the dashboard defaults. Values must be finite JSON
+numbers, with a positive fuel price and cleaning at least every month;
+anything else is a 400. Each result has the KPIs and, unless ``summary`` is
+set, the monthly table in pandas "split" layout.
+"""
+import argparse
+import asyncio
+import json
+import math
+from dataclasses import fields
+from functools import lru_cache
+
+import numpy as np
+
+from projection import CO2_EMISSION_FACTOR, ProjectionParams, compute_projection
+from solvers import first_break_even
+
+RESULT_CACHE_SIZE = 4096
+MAX_BODY_BYTES = 8 * 1024 * 1024
+PARAM_FIELDS = {f.name for f in fields(ProjectionParams)}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def projection_result(params: ProjectionParams):
+    table, total_fuel_mt = compute_projection(params)
+    final = table.iloc[-1]
+    fuel_savings_mt = final["Cumulative Savings"] / params.fuel_price
+    kpis = {
+        "fuel_savings_mt": fuel_savings_mt,
+        "cost_savings": table["Fuel Cost Savings"].sum(),
+        "co2_reduction_mt": fuel_savings_mt * CO2_EMISSION_FACTOR,
+        "profit": final["Profit"],
+        "roi_pct": final["Cumulative ROI"],
+        "total_investment_cost": final["Cumulative Total Cost"],
+        "total_fuel_used_mt": total_fuel_mt,
+        "break_even_month": first_break_even(table["Profit"]),
+    }
+    kpis = {k: None if v is None else float(v) if isinstance(v, (float, np.floating)) else v for k, v in kpis.items()}
+    monthly = {"columns": list(table.columns), "data": table.to_numpy().tolist()}
+    # Serialized once per distinct params; cache hits only re-join the strings
+    try:
+        return json.dumps(kpis, allow_nan=False), json.dumps(monthly, allow_nan=False)
+    except ValueError:
+        raise BadRequest("parameters give non-finite results")
+
+
+def parse_params(item) -> ProjectionParams:
+    if not isinstance(item, dict):
+        raise BadRequest("each scenario must be a JSON object")
+    unknown = set(item) - PARAM_FIELDS
+    if unknown:
+        raise BadRequest(f"unknown parameters: {', '.join(sorted(unknown))}")
+    values = {}
+    for k, v in item.items():
+        if isinstance(v, bool) or not isinstance(v, (int, float)):
+            raise BadRequest(f"{k} must be a finite number")
+        try:
+            values[k] = float(v)  # JSON integers have no size limit
+        except OverflowError:
+            raise BadRequest(f"{k} must be a finite number")
+        if not math.isfinite(values[k]):
+            raise BadRequest(f"{k} must be a finite number")
+    if "years" in values and not values["years"].is_integer():
+        raise BadRequest("years must be a whole number")
+    params = ProjectionParams(**{k: int(v) if k == "years" else v for k, v in values.items()})
+    if not 1 <= params.years <= 100:
+        raise BadRequest("years must be between 1 and 100")
+    if params.fuel_price <= 0:
+        raise BadRequest("fuel_price must be positive")
+    if params.cleaning_frequency < 1:
+        raise BadRequest("cleaning_frequency must be at least 1 month")
+    return params
+
+
+def handle_projection(body: bytes) -> bytes:
+    try:
+        request = json.loads(body or b"{}")
+    except ValueError:
+        raise BadRequest("body is not valid JSON")
+    summary = False
+    if isinstance(request, dict) and "scenarios" in request:
+        summary = bool(request.get("summary", False))
+        items, single = request["scenarios"], False
+    elif isinstance(request, list):
+        items, single = request, False
+    else:
+        items, single = [request], True
+    if not isinstance(items, list):
+        raise BadRequest("scenarios must be a list")
+
+    results = []
+    for params in map(parse_params, items):
+        kpis, monthly = projection_result(params)
+        results.append('{"kpis":' + kpis + ("" if summary else ',"monthly":' + monthly) + "}")
+    return (results[0] if single else '{"results":[' + ",".join(results) + "]}").encode()
+
+
+async def _read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            raise BadRequest("request body too large")
+        if not message.get("more_body", False):
+            return body
+
+
+async def _respond(send, status, payload: bytes):
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(payload)).encode())]})
+    await send({"type": "http.response.body", "body": payload})
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        while (await receive())["type"] != "lifespan.shutdown":
+            await send({"type": "lifespan.startup.complete"})
+        await send({"type": "lifespan.shutdown.complete"})
+        return
+    if scope["type"] != "http":
+        return
+
+    path, method = scope["path"], scope["method"]
+    try:
+        if path == "/health" and method == "GET":
+            info = projection_result.cache_info()
+            payload = json.dumps({"status": "ok", "cache": {"hits": info.hits, "misses": info.misses,
+                                                             "size": info.currsize}}).encode()
+        elif path == "/projection" and method == "POST":
+            body = await _read_body(receive)
+            # Large batches run off the event loop so other requests keep being served
+            if len(body) > 64 * 1024:
+                payload = await asyncio.get_running_loop().run_in_executor(None, handle_projection, body)
+            else:
+                payload = handle_projection(body)
+        elif path in ("/health", "/projection"):
+            return await _respond(send, 405, b'{"error": "method not allowed"}')
+        else:
+            return await _respond(send, 404, b'{"error": "not found"}')
+    except BadRequest as e:
+        return await _respond(send, 400, json.dumps({"error": str(e)}).encode())
+    await _respond(send, 200, payload)
+
+
+# === Built-in server ===
+async def _serve_connection(reader, writer):
+    """Minimal HTTP/1.1 (keep-alive, Content-Length bodies) in front of ``app``."""
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            request_line, *header_lines = head.decode("latin-1").rstrip("\r\n").split("\r\n")
+            method, target, version = request_line.split(" ", 2)
+            headers = [tuple(h.split(":", 1)) for h in header_lines if ":" in h]
+            headers = [(k.strip().lower().encode(), v.strip().encode()) for k, v in headers]
+            lookup = dict(headers)
+            length = int(lookup.get(b"content-length", b"0"))
+            if length > MAX_BODY_BYTES:
+                writer.write(b"HTTP/1.1 413 Payload Too Large\r\ncontent-length: 0\r\nconnection: close\r\n\r\n")
+                break
+            body = await reader.readexactly(length)
+            path, _, query = target.partition("?")
+            scope = {"type": "http", "asgi": {"version": "3.0"}, "http_version": version[5:], "method": method,
+                     "scheme": "http", "path": path, "raw_path": path.encode(), "query_string": query.encode(),
+                     "root_path": "", "headers": headers, "client": writer.get_extra_info("peername"),
+                     "server": writer.get_extra_info("sockname")}
+            response = {}
+
+            async def receive():
+                return {"type": "http.request", "body": body, "more_body": False}
+
+            async def send(message):
+                response.setdefault(message["type"], message)
+
+            await app(scope, receive, send)
+            start, payload = response["http.response.start"], response["http.response.body"]["body"]
+            keep_alive = lookup.get(b"connection", b"").lower() != b"close" and version == "HTTP/1.1"
+            out = [f"HTTP/1.1 {start['status']} {'OK' if start['status'] == 200 else 'Error'}".encode()]
+            out += [k + b": " + v for k, v in start["headers"]]
+            out.append(b"connection: " + (b"keep-alive" if keep_alive else b"close"))
+            writer.write(b"\r\n".join(out) + b"\r\n\r\n" + payload)
+            await writer.drain()
+            if not keep_alive:
+                break
+    except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(host, port):
+    server = await asyncio.start_server(_serve_connection, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the ROI projection as a JSON API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        print(f"Serving on http://{args.host}:{args.port} (built-in server)")
+        asyncio.run(serve(args.host, args.port))
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
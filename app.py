@@ -1,9 +1,23 @@
+import os
+
 import streamlit as st
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib.colors as mcolors
-from scipy.interpolate import make_interp_spline
+
+from charts import cached_chart
+from projection import (APP_COLUMNS, CO2_EMISSION_FACTOR, VESSEL_COLUMNS, ProjectionParams,
+                        compute_fleet_projection, default_fleet, name_vessels, project_fleet_chunks,
+                        read_fleet_chunks, vessel_month_rows)
+from scenarios import (GRID_INPUTS, PERCENTILES, Uncertainty, default_grid_range, grid_axes_overlap, grid_base,
+                       monte_carlo, parameter_grid, sensitivity)
+from sharedcache import shared_result
+from solvers import first_break_even, max_subscription_cost, optimal_cleaning_schedule, required_saving_pct
+from tables import STYLED_ROW_LIMIT, style_table, table_formats
+from timing import RerunTimer, start_metrics_server, stats as timing_stats
+
+timer = RerunTimer()
+if os.environ.get("ROI_METRICS_PORT"):
+    start_metrics_server(int(os.environ["ROI_METRICS_PORT"]))
 
 # Set layout
 st.set_page_config(layout="wide")
@@ -42,103 +56,109 @@ tbody tr:nth-child(even) {
 
 # === Input Section ===
 st.markdown("### Input Parameters")
-col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
-
-with col1:
-    years = st.slider("Contract Duration (Years)", 1, 5, 3)
-    months = years * 12
-    fleet_size = st.number_input("Fleet Size", min_value=1, value=10)
-    fuel_price = st.number_input("Fuel Price ($/MT)", value=550.0)
-    daily_fuel = st.number_input("Daily Fuel Consumption (MT)", value=20.0)
-    op_days = st.number_input("Operating Days per Year", value=200)
-
-with col2:
-    saving_hull = st.select_slider("Hull & Performance Saving (%)", options=np.arange(0, 6, 0.1), value=2.0)
-    saving_voyage = st.select_slider("Voyage Optimization Saving (%)", options=np.arange(0, 6, 0.1), value=1.0)
-    saving_emission = st.select_slider("Emission Cost Avoidance (%)", options=np.arange(0, 6, 0.1), value=0.5)
-    saving_scorecard = st.select_slider("Scorecard Cost Avoidance (%)", options=np.arange(0, 6, 0.1), value=0.2)
-    saving_propulsion = st.select_slider("Propulsion Pro Saving (%)", options=np.arange(0, 6, 0.1), value=0.0)
-
-with col3:
-    cost_hull = st.number_input("Hull App Cost ($)", value=250.0)
-    cost_voyage = st.number_input("Voyage App Cost ($)", value=250.0)
-    cost_emission = st.number_input("Emission App Cost ($)", value=250.0)
-    cost_scorecard = st.number_input("Scorecard App Cost ($)", value=250.0)
-    cost_propulsion = st.number_input("Propulsion Pro App Cost ($)", value=0.0)
-    initial_sub_cost = sum([cost_hull, cost_voyage, cost_emission, cost_scorecard, cost_propulsion])
-
-with col4:
-    c4a, c4b = st.columns(2)
-    with c4a:
-        ramp_up = st.number_input("Ramp-up Delay (Months)", value=6)
-        cleaning_cost = st.number_input("Hull Cleaning Cost ($)", value=15000.0)
-        cleaning_frequency = st.number_input("Cleaning Frequency (Months)", value=9)
-    with c4b:
-        one_time_cost = st.number_input("One-time Cost ($)", value=1000.0)
-        crew_cost = st.number_input("Crew Training Cost ($)", value=100.0)
-        monthly_deterioration = st.number_input("Monthly Deterioration (%)", value=0.1) / 100
-        yearly_sub_increase = st.number_input("Yearly Subscription Increase (%)", value=10.0) / 100
-    ramp_up_saving_pct = st.number_input("Post Ramp-up Saving % of Total", value=60.0) / 100
-    post_cleaning_saving_pct = st.number_input("Post-Hull Cleaning Saving %", value=100.0) / 100
+live_update = st.checkbox("Live update", value=False,
+                          help="Recalculate on every change instead of waiting for Apply")
+inputs = st.container() if live_update else st.form("inputs")
+
+with inputs:
+    col1, col2, col3, col4 = st.columns([1, 1, 1, 2])
+
+    with col1:
+        years = st.slider("Contract Duration (Years)", 1, 5, 3)
+        fleet_size = st.number_input("Fleet Size", min_value=1, value=10)
+        fuel_price = st.number_input("Fuel Price ($/MT)", value=550.0)
+        daily_fuel = st.number_input("Daily Fuel Consumption (MT)", value=20.0)
+        op_days = st.number_input("Operating Days per Year", value=200)
+
+    with col2:
+        saving_hull = st.select_slider("Hull & Performance Saving (%)", options=np.arange(0, 6, 0.1), value=2.0)
+        saving_voyage = st.select_slider("Voyage Optimization Saving (%)", options=np.arange(0, 6, 0.1), value=1.0)
+        saving_emission = st.select_slider("Emission Cost Avoidance (%)", options=np.arange(0, 6, 0.1), value=0.5)
+        saving_scorecard = st.select_slider("Scorecard Cost Avoidance (%)", options=np.arange(0, 6, 0.1), value=0.2)
+        saving_propulsion = st.select_slider("Propulsion Pro Saving (%)", options=np.arange(0, 6, 0.1), value=0.0)
+
+    with col3:
+        cost_hull = st.number_input("Hull App Cost ($)", value=250.0)
+        cost_voyage = st.number_input("Voyage App Cost ($)", value=250.0)
+        cost_emission = st.number_input("Emission App Cost ($)", value=250.0)
+        cost_scorecard = st.number_input("Scorecard App Cost ($)", value=250.0)
+        cost_propulsion = st.number_input("Propulsion Pro App Cost ($)", value=0.0)
+
+    with col4:
+        c4a, c4b = st.columns(2)
+        with c4a:
+            ramp_up = st.number_input("Ramp-up Delay (Months)", value=6)
+            cleaning_cost = st.number_input("Hull Cleaning Cost ($)", value=15000.0)
+            cleaning_frequency = st.number_input("Cleaning Frequency (Months)", value=9)
+        with c4b:
+            one_time_cost = st.number_input("One-time Cost ($)", value=1000.0)
+            crew_cost = st.number_input("Crew Training Cost ($)", value=100.0)
+            monthly_deterioration = st.number_input("Monthly Deterioration (%)", value=0.1) / 100
+            yearly_sub_increase = st.number_input("Yearly Subscription Increase (%)", value=10.0) / 100
+        ramp_up_saving_pct = st.number_input("Post Ramp-up Saving % of Total", value=60.0) / 100
+        post_cleaning_saving_pct = st.number_input("Post-Hull Cleaning Saving %", value=100.0) / 100
+
+    params = ProjectionParams(
+        years=years, fuel_price=fuel_price, daily_fuel=daily_fuel, op_days=op_days,
+        saving_hull=saving_hull, saving_voyage=saving_voyage, saving_emission=saving_emission,
+        saving_scorecard=saving_scorecard, saving_propulsion=saving_propulsion,
+        cost_hull=cost_hull, cost_voyage=cost_voyage, cost_emission=cost_emission,
+        cost_scorecard=cost_scorecard, cost_propulsion=cost_propulsion,
+        ramp_up=ramp_up, cleaning_cost=cleaning_cost, cleaning_frequency=cleaning_frequency,
+        one_time_cost=one_time_cost, crew_cost=crew_cost,
+        monthly_deterioration=monthly_deterioration, yearly_sub_increase=yearly_sub_increase,
+        ramp_up_saving_pct=ramp_up_saving_pct, post_cleaning_saving_pct=post_cleaning_saving_pct)
+
+    with st.expander("🚢 Fleet Vessels"):
+        fleet_file = st.file_uploader(
+            "Upload vessel register (CSV or Parquet)", type=["csv", "parquet"],
+            help="One row per vessel. Optional columns: vessel, " + ", ".join(VESSEL_COLUMNS + APP_COLUMNS)
+                 + ". Missing columns use the inputs above; the file replaces Fleet Size.")
+        customize_fleet = st.checkbox("Customize individual vessels", disabled=fleet_file is not None,
+                                      help="Edits reset when Fleet Size or the per-vessel defaults above change")
+        vessels = default_fleet(params, fleet_size)
+        if customize_fleet and fleet_file is None:
+            vessels = st.data_editor(vessels, key="vessels", hide_index=True, disabled=["vessel"],
+                                     use_container_width=True)
+
+    if not live_update:
+        st.form_submit_button("Apply", type="primary")
+timer.lap("inputs")
 
 # === Core Logic ===
-CO2_EMISSION_FACTOR = 3.114
-monthly_fuel_cost_base = fuel_price * daily_fuel * op_days / 12
-total_saving_pct = saving_hull + saving_voyage + saving_emission + saving_scorecard + saving_propulsion
-
-data = []
-cumulative_sub_cost = 0
-cumulative_savings = 0
-cumulative_total_cost = 0
-total_fuel_mt = 0
-fuel_cost_current = monthly_fuel_cost_base
-sub_cost = initial_sub_cost
-saving_pct = 0
-last_saving_pct = 0
-
-for month in range(1, months + 1):
-    if month % 12 == 1 and month > 1:
-        fuel_cost_current *= (1 + yearly_sub_increase)
-        sub_cost *= (1 + yearly_sub_increase)
-
-    if month < ramp_up:
-        saving_pct = 0
-    elif month > ramp_up and month < cleaning_frequency:
-        saving_pct = total_saving_pct * ramp_up_saving_pct
-    elif month % cleaning_frequency == 0 and month >= ramp_up:
-        saving_pct = total_saving_pct * post_cleaning_saving_pct
-        last_saving_pct = saving_pct
-    else:
-        last_saving_pct = max(0, last_saving_pct - (monthly_deterioration * 100))
-        saving_pct = last_saving_pct
-
-    fuel_saving_dollars = fuel_cost_current * (saving_pct / 100)
-    monthly_fuel_mt = fuel_cost_current / fuel_price
-    total_fuel_mt += monthly_fuel_mt
-    cumulative_savings += fuel_saving_dollars
-    cumulative_sub_cost += sub_cost
-    hull_cleaning = cleaning_cost if (month % cleaning_frequency == 0 and month >= ramp_up) else 0
-    other_cost = one_time_cost + crew_cost if month == 1 else 0
-    total_monthly_cost = sub_cost + hull_cleaning + other_cost
-    cumulative_total_cost += total_monthly_cost
-    profit = cumulative_savings - cumulative_total_cost
-    roi = (profit / cumulative_total_cost) if cumulative_total_cost > 0 else -1
-
-    data.append({
-        "Month": month,
-        "Fuel Cost": round(fuel_cost_current),
-        "Subscription Cost": round(sub_cost),
-        "Cumulative Subscription Cost": round(cumulative_sub_cost),
-        "Hull Cleaning Cost": round(hull_cleaning),
-        "Savings in Fuel (%)": round(saving_pct, 2),
-        "Fuel Cost Savings": round(fuel_saving_dollars),
-        "Cumulative Savings": round(cumulative_savings),
-        "Cumulative Total Cost": round(cumulative_total_cost),
-        "Profit": round(profit),
-        "Cumulative ROI": f"{roi * 100:.1f}%"
-    })
-
-df = pd.DataFrame(data)
+@st.cache_data(show_spinner=False)
+def cached_fleet_projection(params, vessels):
+    return shared_result("fleet", compute_fleet_projection, params, vessels)
+
+@st.cache_data(show_spinner="Projecting fleet file...", max_entries=8)
+def cached_file_projection(params, fleet_file):
+    fleet_file.seek(0)
+    return shared_result(f"fleet_file:{fleet_file.name}", lambda p, f: project_fleet_chunks(p, read_fleet_chunks(f, f.name)),
+                         params, fleet_file)
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def cached_file_vessels(fleet_file):
+    fleet_file.seek(0)
+    return name_vessels(pd.concat(read_fleet_chunks(fleet_file, fleet_file.name), ignore_index=True))
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def cached_vessel_rows(params, vessels, start, stop, first_month, last_month):
+    return vessel_month_rows(params, vessels, start, stop, first_month, last_month)
+
+if fleet_file is not None:
+    try:
+        df, vessel_df, total_fuel_mt = cached_file_projection(params, fleet_file)
+        vessels = cached_file_vessels(fleet_file)
+    except (ValueError, KeyError) as e:
+        st.error(f"Could not read {fleet_file.name}: {e}")
+        st.stop()
+else:
+    try:
+        df, vessel_df, total_fuel_mt = cached_fleet_projection(params, vessels)
+    except ValueError as e:
+        st.error(f"Invalid fleet: {e}")
+        st.stop()
+timer.lap("core")
 
 # === KPIs ===
 fuel_savings_mt = df["Cumulative Savings"].iloc[-1] / fuel_price
@@ -146,66 +166,166 @@ co2_reduction = fuel_savings_mt * CO2_EMISSION_FACTOR
 fmt = lambda x: f"{x/1_000_000:.1f}M" if x > 1_000_000 else f"{x/1_000:.1f}k" if x > 1_000 else f"{x:,.0f}"
 
 st.markdown("### 📊 Key Metrics")
-col1, col2, col3, col4, col5, col6, col7 = st.columns(7)
+col1, col2, col3, col4, col5, col6, col7, col8 = st.columns(8)
 col1.metric("🚢 Fuel Savings (MT)", fmt(fuel_savings_mt))
 col2.metric("💵 Cost Savings ($)", fmt(df["Fuel Cost Savings"].sum()))
 col3.metric("🌱 CO₂ Reduction (MT)", fmt(co2_reduction))
 col4.metric("💰 Profit ($)", fmt(df["Profit"].iloc[-1]))
-col5.metric("📈 ROI", df["Cumulative ROI"].iloc[-1])
+col5.metric("📈 ROI", f"{df['Cumulative ROI'].iloc[-1]:.1f}%")
 col6.metric("💼 Total Investment Cost ($)", fmt(df["Cumulative Total Cost"].iloc[-1]))
 col7.metric("⛽ Total Fuel Used (MT)", fmt(total_fuel_mt))
+break_even = first_break_even(df["Profit"])
+col8.metric("⏱️ Break-even Month", break_even or "Not reached")
 
-# === Charts ===
-def smooth_line(x, y):
-    xnew = np.linspace(min(x), max(x), 300)
-    spl = make_interp_spline(x, y, k=3)
-    ynew = spl(xnew)
-    return xnew, ynew
+needed_saving = required_saving_pct(params)
+max_app_cost = max_subscription_cost(params)
+st.caption(
+    f"Per vessel, breaking even by month {params.months} needs a total saving of "
+    + (f"at least {needed_saving:.2f}%" if needed_saving is not None else "more than 100%")
+    + " or month-1 app costs of "
+    + (f"at most ${max_app_cost:,.0f}" if max_app_cost is not None else "less than $0 (not reachable)")
+    + f" (currently {params.total_saving_pct:.2f}% and ${params.initial_sub_cost:,.0f}).")
+timer.lap("kpis")
 
+# === Charts ===
+chart_theme = "dark" if st.get_option("theme.base") == "dark" else "light"
 st.markdown("### 📈 Trends")
-col_chart1, col_chart2, col_chart3 = st.columns(3)
-
-with col_chart1:
-    x = df["Month"]
-    fig1, ax1 = plt.subplots()
-    for y, color, label in zip(
-        [df["Cumulative Total Cost"], df["Cumulative Savings"], df["Profit"]],
-        ["#cfd8dc", "#a5d6a7", "#ffe082"],
-        ["Total Cost", "Savings", "Profit"]):
-        xs, ys = smooth_line(x, y)
-        ax1.plot(xs, ys, color=color, label=label)
-        ax1.fill_between(xs, ys, color=color, alpha=0.4)
-    ax1.set_title("Investment, Savings, Profit")
-    ax1.legend()
-    ax1.grid(False)
-    st.pyplot(fig1)
-
-with col_chart2:
-    roi_vals = [float(r.strip('%')) for r in df["Cumulative ROI"]]
-    xs, ys = smooth_line(df["Month"], roi_vals)
-    fig2, ax2 = plt.subplots()
-    ax2.plot(xs, ys, color="#90caf9")
-    ax2.fill_between(xs, ys, color="#90caf9", alpha=0.4)
-    ax2.set_title("ROI % Trend")
-    ax2.grid(False)
-    st.pyplot(fig2)
-
-with col_chart3:
-    fig3, ax3 = plt.subplots()
-    ax3.bar(["Savings", "Cost"], [df["Cumulative Savings"].iloc[-1], df["Cumulative Total Cost"].iloc[-1]],
-            color=["#81c784", "#ef9a9a"], alpha=0.8)
-    ax3.set_title("Total Savings vs Cost")
-    ax3.grid(False)
-    st.pyplot(fig3)
+for col_chart, chart_kind in zip(st.columns(3), ["trends", "roi", "totals"]):
+    col_chart.image(cached_chart(chart_kind, df, chart_theme))
+    timer.lap(f"chart_{chart_kind}")
 
 # === Table ===
+def show_table(table):
+    if len(table) <= STYLED_ROW_LIMIT:
+        st.dataframe(style_table(table), hide_index=True, use_container_width=True)
+    else:
+        st.dataframe(table, hide_index=True, use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format=f)
+                                    for c, (_, f) in table_formats(table).items()})
+
+def paginate(total, key):
+    """Page picker; returns the (start, stop) row window to send to the browser."""
+    c1, c2, c3 = st.columns([1, 1, 4])
+    page_size = c1.selectbox("Rows per page", [60, 120, 500, 1000], key=f"{key}_size")
+    pages = max(1, -(-total // page_size))
+    page = min(c2.number_input(f"Page (of {pages:,})", min_value=1, value=1, key=f"{key}_page"), pages)
+    start, stop = (page - 1) * page_size, min(page * page_size, total)
+    c3.caption(f"Rows {start + 1:,}–{stop:,} of {total:,}" if total else "No rows")
+    return start, stop
+
 st.markdown("### 📋 Monthly Table")
-def highlight_profit(val): return 'color: green;' if val > 0 else 'color: red;'
-def highlight_roi(val):
-    try: return 'color: green;' if float(val.strip('%')) > 0 else 'color: red;'
-    except: return ''
+table_view = st.radio("Monthly rows", ["Fleet total", "Per vessel"], horizontal=True, label_visibility="collapsed")
+if table_view == "Fleet total":
+    show_table(df)
+else:
+    fc1, fc2 = st.columns([2, 3])
+    name_filter = fc1.text_input("Filter vessels", placeholder="Vessel name contains...")
+    first_month, last_month = fc2.slider("Months", 1, params.months, (1, params.months))
+    detail = name_vessels(vessels)
+    if name_filter:
+        detail = detail[detail["vessel"].astype(str).str.contains(name_filter, case=False, regex=False)]
+    start, stop = paginate(len(detail) * (last_month - first_month + 1), key="monthly")
+    if stop > start:
+        show_table(cached_vessel_rows(params, detail, start, stop, first_month, last_month))
+
+st.markdown("### 🚢 Per-Vessel Breakdown")
+start, stop = paginate(len(vessel_df), key="breakdown")
+show_table(vessel_df.iloc[start:stop])
+timer.lap("table")
+
+# === Scenario Analysis ===
+st.markdown("### 🔬 Scenario Analysis")
+st.caption("Per-vessel projections using the inputs above.")
+tab_mc, tab_sens, tab_grid, tab_clean = st.tabs(
+    ["🎲 Monte Carlo", "🌪️ Sensitivity", "🗺️ Parameter Grid", "🧽 Cleaning Schedule"])
+
+@st.cache_data(show_spinner="Running Monte Carlo...", max_entries=8)
+def cached_monte_carlo(params, uncertainty):
+    return shared_result("monte_carlo", monte_carlo, params, uncertainty)
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def cached_sensitivity(params, pct):
+    return shared_result("sensitivity", sensitivity, params, pct)
+
+@st.cache_data(show_spinner="Evaluating grid...", max_entries=16)
+def cached_grid(base, x, x_range, y, y_range, steps, month):
+    return shared_result("grid", parameter_grid, base, x, np.linspace(*x_range, steps), y, np.linspace(*y_range, steps),
+                         month)
+
+with tab_mc:
+    mc1, mc2, mc3, mc4, mc5 = st.columns(5)
+    draws = mc1.selectbox("Draws", [10_000, 50_000, 100_000], format_func="{:,}".format)
+    fuel_spread = mc2.number_input("Fuel Price σ (%)", min_value=0.0, value=20.0)
+    saving_spread = mc3.number_input("Savings σ (%)", min_value=0.0, value=25.0)
+    deterioration_spread = mc4.number_input("Deterioration σ (%)", min_value=0.0, value=50.0)
+    ramp_spread = mc5.number_input("Ramp-up ± (Months)", min_value=0, value=2)
+    if st.checkbox("Run Monte Carlo", key="run_mc"):
+        mc = cached_monte_carlo(params, Uncertainty(draws, fuel_spread, saving_spread, deterioration_spread, ramp_spread))
+        k = st.columns(6)
+        for i, q in enumerate(PERCENTILES):
+            k[i].metric(f"💰 Profit P{q} ($)", fmt(np.percentile(mc.final_profit, q)))
+            k[i + 3].metric(f"📈 ROI P{q}", f"{np.percentile(mc.final_roi, q):.1f}%")
+        fan1, fan2 = st.columns(2)
+        fan1.image(cached_chart("profit_fan", mc.bands, chart_theme))
+        fan2.image(cached_chart("roi_fan", mc.bands, chart_theme))
+timer.lap("monte_carlo")
+
+with tab_sens:
+    sc1, sc2 = st.columns([1, 3])
+    perturbation = sc1.number_input("Perturbation (±%)", min_value=1.0, max_value=100.0, value=10.0)
+    sens_metric = sc2.radio("Metric", ["Profit", "ROI"], horizontal=True)
+    if st.checkbox("Run sensitivity", key="run_sens"):
+        sens = cached_sensitivity(params, perturbation)
+        st.image(cached_chart(f"{sens_metric.lower()}_tornado", sens, chart_theme))
+        with st.expander("Sensitivity table"):
+            st.dataframe(sens, hide_index=True, use_container_width=True)
+timer.lap("sensitivity")
+
+with tab_grid:
+    gc1, gc2, gc3, gc4 = st.columns(4)
+    grid_names = list(GRID_INPUTS)
+    grid_x = gc1.selectbox("X axis", grid_names, index=grid_names.index("cleaning_frequency"),
+                           format_func=GRID_INPUTS.get)
+    grid_x_lo, grid_x_hi = default_grid_range(params, grid_x)
+    grid_x_range = (gc1.number_input("X from", value=grid_x_lo, key=f"grid_x_lo_{grid_x}"),
+                    gc1.number_input("X to", value=grid_x_hi, key=f"grid_x_hi_{grid_x}"))
+    grid_y = gc2.selectbox("Y axis", grid_names, index=grid_names.index("total_saving_pct"),
+                           format_func=GRID_INPUTS.get)
+    grid_y_lo, grid_y_hi = default_grid_range(params, grid_y)
+    grid_y_range = (gc2.number_input("Y from", value=grid_y_lo, key=f"grid_y_lo_{grid_y}"),
+                    gc2.number_input("Y to", value=grid_y_hi, key=f"grid_y_hi_{grid_y}"))
+    grid_steps = gc3.select_slider("Resolution", [25, 50, 100, 200], value=100)
+    break_even_year = gc4.selectbox("Break even by year", range(1, years + 1), index=years - 1)
+    if grid_axes_overlap(grid_x, grid_y):
+        st.warning("Pick two independent inputs for the grid axes (the total saving includes each app saving).")
+    elif st.checkbox("Run grid", key="run_grid"):
+        grid = cached_grid(grid_base(params, grid_x, grid_y), grid_x, grid_x_range, grid_y, grid_y_range,
+                           grid_steps, break_even_year * 12)
+        st.image(cached_chart("grid", grid, chart_theme))
+timer.lap("grid")
 
-styled_df = df.style.applymap(highlight_profit, subset=["Profit"]) \
-                    .applymap(highlight_roi, subset=["Cumulative ROI"])
+with tab_clean:
+    plan = optimal_cleaning_schedule(params)
+    cl1, cl2, cl3 = st.columns(3)
+    cl1.metric("💰 Profit, Optimal Schedule ($)", fmt(plan.profit), delta=fmt(plan.profit - plan.baseline_profit))
+    cl2.metric(f"💰 Profit, Every {cleaning_frequency} Months ($)", fmt(plan.baseline_profit))
+    cl3.metric("🧽 Cleanings", f"{len(plan.months)} vs {len(plan.baseline_months)}")
+    st.markdown("**Optimal cleaning months:** " + (", ".join(map(str, plan.months)) or "none"))
+    st.caption("Any month on or after ramp-up may be chosen; the ramp-up plateau lasts until the first cleaning.")
+timer.lap("cleaning")
 
-st.write(styled_df)
+# === Timings ===
+timing_stats.record(timer)
+if os.environ.get("ROI_DEBUG_TIMINGS"):
+    with st.expander("⏱️ Rerun Timings"):
+        timings = pd.DataFrame.from_dict(timing_stats.summary(), orient="index")
+        timings["this_run"] = pd.Series({**timer.phases, "total": timer.total})
+        st.dataframe(pd.DataFrame({
+            "Phase": timings.index,
+            "This Run (ms)": timings["this_run"] * 1000,
+            "p50 (ms)": timings["p50"] * 1000,
+            "p95 (ms)": timings["p95"] * 1000,
+            "Reruns": timings["count"],
+        }), hide_index=True, use_container_width=True,
+            column_config={c: st.column_config.NumberColumn(format="%.1f")
+                           for c in ["This Run (ms)", "p50 (ms)", "p95 (ms)"]})
@@ -0,0 +1,179 @@
+"""Headless batch projections.
+
+    python batch.py scenarios.csv -o results.parquet [--summary] [--workers N]
+
+Each scenario (a CSV row, or an item of a YAML list) sets any ``ProjectionParams``
+field, in the same units as ``ProjectionParams`` (deterioration, subscription
+increase, ramp-up and post-cleaning saving as fractions); missing fields take
+the dashboard defaults. An optional ``scenario`` column names the rows. Output
+is one row per scenario and month (or only the final month with --summary),
+written as CSV or Parquet by file extension.
+
+Scenarios are projected in chunks spread over a process pool, and results
+are written as chunks finish. CSV files are also read in chunks, so memory
+stays bounded however many scenarios there are; a YAML file is parsed whole
+first, so very large scenario sets belong in CSV. Only numpy and pandas are
+needed (plus pyarrow for Parquet and PyYAML for YAML input).
+
+Values are checked as the dashboard and API check them: finite numbers, a
+whole number of years from 1 to 100, a positive fuel price and cleaning at
+least every month. The first invalid scenario stops the run with its name.
+"""
+import argparse
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields
+
+import numpy as np
+import pandas as pd
+
+from projection import ProjectionParams, batch_kwargs, batch_table, project_batch
+
+SCENARIO_CHUNK_SIZE = 1_000
+PARAM_FIELDS = [f.name for f in fields(ProjectionParams)]
+
+
+def read_scenarios(path, chunksize=SCENARIO_CHUNK_SIZE):
+    """Yield scenarios from a CSV or YAML file in DataFrames of ``chunksize`` rows."""
+    if path.lower().endswith((".yaml", ".yml")):
+        import yaml
+        with open(path) as f:
+            data = yaml.safe_load(f)
+        if isinstance(data, dict):
+            data = data.get("scenarios", [])
+        scenarios = pd.DataFrame(data)
+        for start in range(0, len(scenarios), chunksize):
+            yield scenarios.iloc[start:start + chunksize]
+    elif path.lower().endswith(".csv"):
+        yield from pd.read_csv(path, chunksize=chunksize)
+    else:
+        raise ValueError(f"Unsupported scenario file {path!r}: expected .csv, .yaml or .yml")
+
+
+def _check_scenarios(scenarios, names):
+    params = scenarios.drop(columns="scenario", errors="ignore")
+    try:
+        values = params.to_numpy(dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError("Scenario values must be numbers")
+    checks = [(~np.isfinite(values).all(axis=1), "values must be finite numbers")]
+    if "years" in params:
+        years = params["years"].to_numpy(dtype=float)
+        checks.append(((years != np.round(years)) | (years < 1) | (years > 100),
+                       "years must be a whole number between 1 and 100"))
+    if "fuel_price" in params:
+        checks.append((params["fuel_price"].to_numpy(dtype=float) <= 0, "fuel_price must be positive"))
+    if "cleaning_frequency" in params:
+        checks.append((params["cleaning_frequency"].to_numpy(dtype=float) < 1,
+                       "cleaning_frequency must be at least 1 month"))
+    for invalid, message in checks:
+        if invalid.any():
+            raise ValueError(f"Scenario {names[invalid.argmax()]!r}: {message}")
+
+
+def project_scenarios(scenarios: pd.DataFrame, summary: bool = False) -> pd.DataFrame:
+    """Monthly (or final-month) results for a DataFrame of scenarios."""
+    unknown = set(scenarios.columns) - set(PARAM_FIELDS) - {"scenario"}
+    if unknown:
+        raise ValueError(f"Unknown scenario columns: {', '.join(sorted(unknown))}")
+    defaults = ProjectionParams()
+    names = scenarios["scenario"] if "scenario" in scenarios else pd.Series(scenarios.index.map(str))
+    names = names.to_numpy()
+    # Fields left blank in a row (or missing from a YAML item) take the dashboard defaults
+    scenarios = scenarios.fillna({c: getattr(defaults, c) for c in scenarios if c != "scenario"})
+    _check_scenarios(scenarios, names)
+    years = scenarios["years"].to_numpy(dtype=int) if "years" in scenarios else np.full(len(scenarios), defaults.years)
+
+    tables, order = [], []
+    # Every run in one batch shares the same number of months
+    for y in np.unique(years):
+        group = years == y
+        overrides = {c: scenarios[c].to_numpy(dtype=float)[group] for c in scenarios if c not in ("scenario", "years")}
+        r = project_batch(**batch_kwargs(ProjectionParams(years=int(y)), **overrides))
+        months = 1 if summary else int(y) * 12
+        table = batch_table(r, first_month=int(y) * 12 - months + 1)
+        table.insert(0, "Scenario", np.repeat(names[group], months))
+        tables.append(table)
+        order.append(np.repeat(np.flatnonzero(group), months))
+    # Back to input order, months ascending within each scenario
+    return pd.concat(tables, ignore_index=True).iloc[np.argsort(np.concatenate(order), kind="stable")] \
+        .reset_index(drop=True)
+
+
+class _Writer:
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.lower().endswith(".parquet")
+        if not self.parquet and not path.lower().endswith(".csv"):
+            raise ValueError(f"Unsupported output file {path!r}: expected .csv or .parquet")
+        self._writer = None
+        self._header = True
+
+    def write(self, table):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            batch = pa.Table.from_pandas(table, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, batch.schema)
+            self._writer.write_table(batch)
+        else:
+            table.to_csv(self.path, mode="w" if self._header else "a", header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def run(scenario_path, output_path, summary=False, workers=None, chunksize=SCENARIO_CHUNK_SIZE):
+    """Project every scenario in ``scenario_path`` into ``output_path``; returns the row count."""
+    workers = workers or os.cpu_count() or 1
+    writer = _Writer(output_path)
+    rows = 0
+    try:
+        if workers == 1:
+            for chunk in read_scenarios(scenario_path, chunksize):
+                table = project_scenarios(chunk, summary)
+                writer.write(table)
+                rows += len(table)
+            return rows
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            # Keep a bounded number of chunks in flight and write them in input order
+            pending = deque()
+            for chunk in read_scenarios(scenario_path, chunksize):
+                pending.append(pool.submit(project_scenarios, chunk, summary))
+                if len(pending) >= 2 * workers:
+                    table = pending.popleft().result()
+                    writer.write(table)
+                    rows += len(table)
+            while pending:
+                table = pending.popleft().result()
+                writer.write(table)
+                rows += len(table)
+        return rows
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run ROI projections for a file of scenarios.")
+    parser.add_argument("scenarios", help="scenario file (.csv, .yaml or .yml)")
+    parser.add_argument("-o", "--output", required=True, help="results file (.csv or .parquet)")
+    parser.add_argument("--summary", action="store_true", help="write only the final month of each scenario")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument("--chunksize", type=int, default=SCENARIO_CHUNK_SIZE, help="scenarios per chunk")
+    args = parser.parse_args(argv)
+    try:
+        rows = run(args.scenarios, args.output, args.summary, args.workers, args.chunksize)
+    except (OSError, ValueError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 1
+    print(f"Wrote {rows:,} rows to {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""Benchmarks for the projection, chart and table stages.
+
+    python bench.py [-o results.json] [--baseline bench_baseline.json] [--threshold 0.25] [-k fleet]
+    python bench.py --save-baseline
+
+Times the single-vessel projection for every contract horizon (12-60
+months), fleet and Monte Carlo runs of 1, 100 and 10,000 vessels/draws per
+horizon, fleet reruns after a downstream-only input change (with the stage
+cache on, though the 10,000-vessel fleet is too large for it; every other
+case runs with it off), chart rendering (uncached, and a render-cache hit),
+and table styling. Runs headlessly without Streamlit.
+Each case reports the median and minimum of repeated runs after a warm-up.
+Results are written as JSON and compared with the baseline; medians more
+than ``--threshold`` slower count as regressions and make the exit status 1.
+
+Timings depend on the machine, so record the baseline on the machine that
+runs the comparison (``--save-baseline``) and refresh it when that changes.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import replace
+from datetime import datetime, timezone
+
+import matplotlib
+import numpy as np
+import pandas as pd
+
+from charts import cached_chart, render_chart
+from projection import ProjectionParams, compute_fleet_projection, compute_projection, default_fleet, stage_cache, \
+    vessel_month_rows
+from scenarios import Uncertainty, monte_carlo
+from sharedcache import LRUCache
+from tables import style_table
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+HORIZONS = [12, 24, 36, 48, 60]
+BATCH_SIZES = [1, 100, 10_000]
+MIN_TIME = 0.2
+MIN_REPEATS = 3
+MAX_REPEATS = 100
+
+
+def measure(fn, min_time=MIN_TIME):
+    """Median and minimum seconds per call of ``fn``: one warm-up call, then
+    repeat for at least ``min_time`` seconds and ``MIN_REPEATS`` calls."""
+    fn()
+    times = []
+    start = time.perf_counter()
+    while len(times) < MIN_REPEATS or (time.perf_counter() - start < min_time and len(times) < MAX_REPEATS):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return {"median_s": statistics.median(times), "min_s": min(times), "repeats": len(times)}
+
+
+def cases():
+    """(name, callable) for every benchmark."""
+    for months in HORIZONS:
+        p = ProjectionParams(years=months // 12)
+        yield f"projection/{months}", lambda p=p: compute_projection(p)
+        for n in BATCH_SIZES:
+            vessels = default_fleet(p, n)
+            yield f"fleet/{months}/{n}", lambda p=p, v=vessels: compute_fleet_projection(p, v)
+        for n in BATCH_SIZES:
+            u = Uncertainty(draws=n)
+            yield f"monte_carlo/{months}/{n}", lambda p=p, u=u: monte_carlo(p, u)
+
+    # A new cleaning cost on every call: only the cost stack and profit/ROI are recomputed
+    p = ProjectionParams(years=5)
+    for n in BATCH_SIZES:
+        vessels, costs = default_fleet(p, n), itertools.count(15_000)
+        yield f"incremental/{p.months}/{n}", \
+            lambda v=vessels, c=costs: compute_fleet_projection(replace(p, cleaning_cost=float(next(c))), v)
+
+    p = ProjectionParams()
+    df = compute_projection(p).table
+    cache = LRUCache(64 * 1024 * 1024)
+    for kind in ["trends", "roi", "totals"]:
+        yield f"chart/{kind}", lambda kind=kind: render_chart(kind, df)
+        yield f"chart_cached/{kind}", lambda kind=kind: cached_chart(kind, df, cache=cache)
+
+    vessels = default_fleet(p, 1_000)
+    for rows, table in [(p.months, df), (1_000, vessel_month_rows(p, vessels, 0, 1_000))]:
+        yield f"table_style/{rows}", lambda table=table: style_table(table).to_html()
+
+
+def run(pattern=None, min_time=MIN_TIME):
+    results = {}
+    stage_cache_bytes = stage_cache.max_bytes
+    for name, fn in cases():
+        if pattern and pattern not in name:
+            continue
+        # Other cases time full projections, not repeats served from the stage cache
+        stage_cache.clear()
+        stage_cache.max_bytes = stage_cache_bytes if name.startswith("incremental/") else 0
+        results[name] = measure(fn, min_time)
+        print(f"{name:<28} {results[name]['median_s'] * 1000:>10.3f} ms", file=sys.stderr)
+    stage_cache.max_bytes = stage_cache_bytes
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "processor": platform.processor(),
+            "cpus": os.cpu_count(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "matplotlib": matplotlib.__version__,
+        },
+        "results": results,
+    }
+
+
+def compare(results, baseline, threshold):
+    """Names of cases whose median is more than ``threshold`` (a fraction) slower than ``baseline``."""
+    regressions = []
+    for name, r in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = r["median_s"] / base["median_s"]
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<28} {base['median_s'] * 1000:>10.3f} -> {r['median_s'] * 1000:>10.3f} ms  "
+              f"x{ratio:.2f}{flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the projection, chart and table stages.")
+    parser.add_argument("-o", "--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="baseline JSON to compare with")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown of a median before it counts as a regression (0.25 = 25%%)")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("-k", dest="pattern", help="only run cases whose name contains this")
+    parser.add_argument("--min-time", type=float, default=MIN_TIME, help="seconds to spend repeating each case")
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern, args.min_time)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    elif not args.save_baseline:
+        print(text)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            f.write(text + "\n")
+        print(f"Saved baseline to {args.baseline}", file=sys.stderr)
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one", file=sys.stderr)
+        return 0
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.threshold:.0%}: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,197 @@
+import hashlib
+import os
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+
+from sharedcache import LRUCache, TieredCache, disk_cache
+
+# Figures are built with the object-oriented API rather than pyplot, so they
+# are never registered with pyplot's global figure manager and are freed as
+# soon as the last reference goes away. matplotlib and scipy are imported on
+# first render so a fresh worker can serve its first page without paying for
+# them until a chart is actually drawn.
+
+
+SMOOTH_POINTS = 300
+
+
+@lru_cache(maxsize=16)
+def _smoothing_basis(x):
+    """(SMOOTH_POINTS, len(x)) matrix mapping values at ``x`` to the cubic
+    interpolating spline through them, evaluated on an even grid."""
+    from scipy.interpolate import make_interp_spline
+    x = np.asarray(x, dtype=float)
+    xnew = np.linspace(x.min(), x.max(), SMOOTH_POINTS)
+    # The spline is linear in y, so interpolating the identity gives its basis.
+    return xnew, make_interp_spline(x, np.eye(len(x)), k=3)(xnew)
+
+
+def smooth_lines(x, ys):
+    """Smooth several series sampled at ``x`` with one matrix multiply.
+
+    ``ys`` is a sequence of series; returns the fine grid and a
+    (SMOOTH_POINTS, len(ys)) array of smoothed values."""
+    xnew, basis = _smoothing_basis(tuple(np.asarray(x, dtype=float)))
+    return xnew, basis @ np.column_stack(ys).astype(float)
+
+
+def smooth_line(x, y):
+    xnew, ynew = smooth_lines(x, [y])
+    return xnew, ynew[:, 0]
+
+
+def _new_axes():
+    from matplotlib.figure import Figure
+    fig = Figure()
+    return fig, fig.subplots()
+
+
+def trends_chart(df):
+    fig, ax = _new_axes()
+    xs, smoothed = smooth_lines(df["Month"], [df["Cumulative Total Cost"], df["Cumulative Savings"], df["Profit"]])
+    for ys, color, label in zip(
+        smoothed.T,
+        ["#cfd8dc", "#a5d6a7", "#ffe082"],
+        ["Total Cost", "Savings", "Profit"]):
+        ax.plot(xs, ys, color=color, label=label)
+        ax.fill_between(xs, ys, color=color, alpha=0.4)
+    ax.set_title("Investment, Savings, Profit")
+    ax.legend()
+    ax.grid(False)
+    return fig
+
+
+def roi_chart(df):
+    xs, ys = smooth_line(df["Month"], df["Cumulative ROI"])
+    fig, ax = _new_axes()
+    ax.plot(xs, ys, color="#90caf9")
+    ax.fill_between(xs, ys, color="#90caf9", alpha=0.4)
+    ax.set_title("ROI % Trend")
+    ax.grid(False)
+    return fig
+
+
+def totals_chart(df):
+    fig, ax = _new_axes()
+    ax.bar(["Savings", "Cost"], [df["Cumulative Savings"].iloc[-1], df["Cumulative Total Cost"].iloc[-1]],
+           color=["#81c784", "#ef9a9a"], alpha=0.8)
+    ax.set_title("Total Savings vs Cost")
+    ax.grid(False)
+    return fig
+
+
+def _fan_chart(bands, prefix, color, title):
+    fig, ax = _new_axes()
+    x = bands["Month"]
+    ax.fill_between(x, bands[f"{prefix} P10"], bands[f"{prefix} P90"], color=color, alpha=0.3, label="P10–P90")
+    ax.plot(x, bands[f"{prefix} P50"], color=color, label="P50")
+    ax.axhline(0, color="#9e9e9e", linewidth=0.8)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(False)
+    return fig
+
+
+def profit_fan_chart(bands):
+    return _fan_chart(bands, "Profit", "#ffb300", "Profit Uncertainty")
+
+
+def roi_fan_chart(bands):
+    return _fan_chart(bands, "ROI", "#42a5f5", "ROI % Uncertainty")
+
+
+def _tornado_chart(sens, metric, title):
+    sens = sens.sort_values(f"{metric} Swing")
+    base = sens.attrs[f"base_{metric.lower()}"]
+    fig, ax = _new_axes()
+    fig.set_figheight(max(4.8, 0.3 * len(sens)))
+    y = np.arange(len(sens))
+    ax.barh(y, sens[f"{metric} Low"] - base, left=base, color="#ef9a9a", label="Input lowered")
+    ax.barh(y, sens[f"{metric} High"] - base, left=base, color="#81c784", label="Input raised")
+    ax.axvline(base, color="#616161", linewidth=0.8)
+    ax.set_yticks(y, sens["Parameter"])
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(False)
+    return fig
+
+
+def profit_tornado_chart(sens):
+    return _tornado_chart(sens, "Profit", "Final Profit Sensitivity ($)")
+
+
+def roi_tornado_chart(sens):
+    return _tornado_chart(sens, "ROI", "Final ROI Sensitivity (%)")
+
+
+def grid_chart(grid):
+    a = grid.attrs
+    shape = (a["ny"], a["nx"])
+    xs = grid[a["x"]].to_numpy().reshape(shape)
+    ys = grid[a["y"]].to_numpy().reshape(shape)
+    fig, ax = _new_axes()
+    mesh = ax.pcolormesh(xs, ys, grid["ROI"].to_numpy().reshape(shape), cmap="RdYlGn", shading="auto")
+    fig.colorbar(mesh, ax=ax, label="Final ROI (%)")
+    profit = grid["Profit"].to_numpy().reshape(shape)
+    if min(shape) > 1 and profit.min() < 0 < profit.max():
+        ax.contour(xs, ys, profit, levels=[0], colors="black", linewidths=1.5)
+        ax.plot([], [], color="black", label=f"Break-even by month {a['month']}")
+        ax.legend(loc="upper right")
+    ax.set_xlabel(a["x"])
+    ax.set_ylabel(a["y"])
+    ax.set_title("Final ROI and Break-even")
+    return fig
+
+
+CHARTS = {
+    "trends": trends_chart,
+    "roi": roi_chart,
+    "totals": totals_chart,
+    "profit_fan": profit_fan_chart,
+    "roi_fan": roi_fan_chart,
+    "profit_tornado": profit_tornado_chart,
+    "roi_tornado": roi_tornado_chart,
+    "grid": grid_chart,
+}
+
+
+THEMES = {
+    "light": "default",
+    "dark": "dark_background",
+}
+
+
+def render_chart(kind, df, theme="light", fmt="png", dpi=200):
+    """Rasterize one of ``CHARTS`` to PNG (or SVG) bytes, the same way ``st.pyplot`` does."""
+    import matplotlib.style
+    with matplotlib.style.context(THEMES[theme]):
+        fig = CHARTS[kind](df)
+        buf = BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def projection_hash(df):
+    """Stable content hash of a projection table."""
+    h = hashlib.blake2b(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes(), digest_size=16)
+    h.update("|".join(df.columns).encode())
+    h.update(repr(sorted(df.attrs.items())).encode())
+    return h.hexdigest()
+
+
+# Shared by every session in the process, over the on-disk tier when ROI_CACHE_DIR is set
+render_cache = TieredCache(LRUCache(int(os.environ.get("ROI_CHART_CACHE_BYTES", 64 * 1024 * 1024))),
+                           disk_cache)
+
+
+def cached_chart(kind, df, theme="light", fmt="png", cache=render_cache):
+    """``render_chart`` through ``cache``, keyed by (projection hash, chart, theme, format)."""
+    key = (projection_hash(df), kind, theme, fmt)
+    data = cache.get(key)
+    if data is None:
+        data = render_chart(kind, df, theme=theme, fmt=fmt)
+        cache.put(key, data)
+    return data
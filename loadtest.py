@@ -0,0 +1,211 @@
+"""Concurrent-session load test for the dashboard.
+
+    python loadtest.py [--users 10] [--reruns 20] [--changes 2] [--think 0.5] [-o report.json]
+
+Each simulated user is a ``streamlit.testing.v1.AppTest`` session on its own
+thread. Users share one process, so st.cache_data, the chart render cache and
+the GIL are shared as they are under ``streamlit run``. Every user runs the
+script once (cold), then repeatedly changes ``--changes`` random inputs from
+the four input columns, presses Apply, and waits ``--think`` seconds. AppTest's
+first run (script compilation, widget registration) is not thread-safe, so
+cold runs take turns; warm reruns overlap freely.
+
+Reports the per-rerun latency distribution (cold and warm separately),
+throughput, process CPU time and resident memory (sampled every 100 ms), plus
+the per-phase p50/p95 that the dashboard records in ``timing.stats``. Errors
+raised by the dashboard are reported apart from failures of the harness
+itself; only the former make the exit status 1. Runs entirely locally; needs
+no server or browser.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import sys
+import threading
+import time
+
+import numpy as np
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+SAVING_OPTIONS = np.arange(0, 6, 0.1)
+# Label: (low, high) of the random values; ints where the widget holds ints
+NUMBER_INPUTS = {
+    "Fleet Size": (1, 50),
+    "Fuel Price ($/MT)": (300.0, 900.0),
+    "Daily Fuel Consumption (MT)": (5.0, 60.0),
+    "Operating Days per Year": (150, 350),
+    "Hull App Cost ($)": (0.0, 1000.0),
+    "Voyage App Cost ($)": (0.0, 1000.0),
+    "Emission App Cost ($)": (0.0, 1000.0),
+    "Scorecard App Cost ($)": (0.0, 1000.0),
+    "Propulsion Pro App Cost ($)": (0.0, 1000.0),
+    "Ramp-up Delay (Months)": (0, 12),
+    "Hull Cleaning Cost ($)": (5000.0, 30000.0),
+    "Cleaning Frequency (Months)": (3, 24),
+    "One-time Cost ($)": (0.0, 5000.0),
+    "Crew Training Cost ($)": (0.0, 1000.0),
+    "Monthly Deterioration (%)": (0.0, 0.5),
+    "Yearly Subscription Increase (%)": (0.0, 20.0),
+    "Post Ramp-up Saving % of Total": (20.0, 100.0),
+    "Post-Hull Cleaning Saving %": (50.0, 100.0),
+}
+SLIDERS = {"Contract Duration (Years)": (1, 5)}
+SELECT_SLIDERS = ["Hull & Performance Saving (%)", "Voyage Optimization Saving (%)", "Emission Cost Avoidance (%)",
+                  "Scorecard Cost Avoidance (%)", "Propulsion Pro Saving (%)"]
+PERCENTILES = [50, 90, 95, 99]
+_cold_run_lock = threading.Lock()
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class MemorySampler(threading.Thread):
+    """Samples resident memory every ``interval`` seconds until stopped."""
+
+    def __init__(self, interval=0.1):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.samples = []
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.is_set():
+            self.samples.append(_rss_bytes())
+            self._done.wait(self.interval)
+
+    def stop(self):
+        self._done.set()
+        self.join()
+        self.samples.append(_rss_bytes())
+
+
+def change_inputs(at, rng, changes):
+    """Set ``changes`` random inputs from col1-col4; returns their labels."""
+    widgets = {w.label: w for w in [*at.number_input, *at.slider, *at.select_slider]}
+    labels = rng.sample([l for l in [*NUMBER_INPUTS, *SLIDERS, *SELECT_SLIDERS] if l in widgets], changes)
+    for label in labels:
+        if label in SELECT_SLIDERS:
+            value = SAVING_OPTIONS[rng.randrange(len(SAVING_OPTIONS))]
+        else:
+            low, high = NUMBER_INPUTS.get(label) or SLIDERS[label]
+            value = rng.randint(low, high) if isinstance(low, int) else round(rng.uniform(low, high), 2)
+        widgets[label].set_value(value)
+    return labels
+
+
+def simulate_user(user, reruns, changes, think, seed, timeout, latencies, errors, harness_errors):
+    from streamlit.testing.v1 import AppTest
+    rng = random.Random(seed + user)
+    try:
+        with _cold_run_lock:
+            at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+            t = time.perf_counter()
+            at.run()
+            latencies.append(("cold", time.perf_counter() - t))
+        if at.exception:
+            errors.append({"user": user, "changed": [], "error": at.exception[0].message})
+            return
+        for _ in range(reruns):
+            time.sleep(think)
+            labels = change_inputs(at, rng, changes)
+            apply = next(b for b in at.button if b.label == "Apply")
+            t = time.perf_counter()
+            apply.click().run()
+            latencies.append(("warm", time.perf_counter() - t))
+            if at.exception:
+                errors.append({"user": user, "changed": labels, "error": at.exception[0].message})
+    except Exception as e:  # a timed-out or crashed session ends that user only
+        harness_errors.append({"user": user, "error": repr(e)})
+
+
+def _distribution(seconds):
+    if not seconds:
+        return None
+    s = np.array(seconds) * 1000
+    return {"count": len(s), "mean_ms": float(s.mean()), "max_ms": float(s.max()),
+            **{f"p{q}_ms": float(v) for q, v in zip(PERCENTILES, np.percentile(s, PERCENTILES))}}
+
+
+def run(users=10, reruns=20, changes=2, think=0.5, seed=0, timeout=300):
+    from streamlit import logger as st_logger
+    st_logger.set_log_level("error")
+
+    latencies, errors, harness_errors = [], [], []
+    memory = MemorySampler()
+    memory.start()
+    cpu_start, wall_start = time.process_time(), time.perf_counter()
+    args = (reruns, changes, think, seed, timeout, latencies, errors, harness_errors)
+    threads = [threading.Thread(target=simulate_user, args=(u, *args)) for u in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    memory.stop()
+
+    from timing import stats as timing_stats
+    return {
+        "config": {"users": users, "reruns": reruns, "changes": changes, "think_s": think, "seed": seed},
+        "cold": _distribution([s for kind, s in latencies if kind == "cold"]),
+        "warm": _distribution([s for kind, s in latencies if kind == "warm"]),
+        "throughput_reruns_per_s": len(latencies) / wall,
+        "wall_s": wall,
+        "cpu_s": cpu,
+        "cpu_utilization": cpu / wall,
+        "rss_mb": {"start": memory.samples[0] / 2**20, "peak": max(memory.samples) / 2**20,
+                   "end": memory.samples[-1] / 2**20,
+                   "max_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024},
+        "phases_ms": {name: {"p50": s["p50"] * 1000, "p95": s["p95"] * 1000}
+                      for name, s in timing_stats.summary().items()},
+        "errors": errors,
+        "harness_errors": harness_errors,
+    }
+
+
+def print_report(report, file=sys.stderr):
+    c = report["config"]
+    print(f"{c['users']} users x {c['reruns']} reruns, {c['changes']} changes each, {c['think_s']} s think time",
+          file=file)
+    for kind in ["cold", "warm"]:
+        d = report[kind]
+        if d:
+            print(f"  {kind:<5} n={d['count']:<5} mean {d['mean_ms']:8.0f} ms  "
+                  + "  ".join(f"p{q} {d[f'p{q}_ms']:8.0f}" for q in PERCENTILES) + f"  max {d['max_ms']:8.0f}",
+                  file=file)
+    m = report["rss_mb"]
+    print(f"  {report['throughput_reruns_per_s']:.2f} reruns/s over {report['wall_s']:.1f} s, "
+          f"CPU {report['cpu_s']:.1f} s ({report['cpu_utilization']:.0%} of one core)", file=file)
+    print(f"  RSS {m['start']:.0f} -> peak {m['peak']:.0f} -> {m['end']:.0f} MB", file=file)
+    print("  phase p50/p95 (ms): " + ", ".join(f"{k} {v['p50']:.0f}/{v['p95']:.0f}"
+                                              for k, v in report["phases_ms"].items()), file=file)
+    if report["errors"]:
+        print(f"  {len(report['errors'])} app error(s), first: {report['errors'][0]}", file=file)
+    if report["harness_errors"]:
+        print(f"  {len(report['harness_errors'])} harness error(s), first: {report['harness_errors'][0]}", file=file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard users with AppTest.")
+    parser.add_argument("--users", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=20, help="input changes per user after the first run")
+    parser.add_argument("--changes", type=int, default=2, help="inputs changed before each Apply")
+    parser.add_argument("--think", type=float, default=0.5, help="seconds each user waits between reruns")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per script run")
+    parser.add_argument("-o", "--output", help="write the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.users, args.reruns, args.changes, args.think, args.seed, args.timeout)
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if report["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
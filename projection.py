@@ -0,0 +1,466 @@
+import hashlib
+import os
+from dataclasses import dataclass, replace
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from sharedcache import LRUCache
+
+CO2_EMISSION_FACTOR = 3.114
+
+
+@dataclass(frozen=True)
+class ProjectionParams:
+    """Inputs of one ROI projection. Percent-of inputs entered as "%" in the
+    dashboard (deterioration, subscription increase, ramp-up and post-cleaning
+    saving) are stored as fractions; the five app savings stay in percent."""
+    years: int = 3
+    fuel_price: float = 550.0
+    daily_fuel: float = 20.0
+    op_days: float = 200
+    saving_hull: float = 2.0
+    saving_voyage: float = 1.0
+    saving_emission: float = 0.5
+    saving_scorecard: float = 0.2
+    saving_propulsion: float = 0.0
+    cost_hull: float = 250.0
+    cost_voyage: float = 250.0
+    cost_emission: float = 250.0
+    cost_scorecard: float = 250.0
+    cost_propulsion: float = 0.0
+    ramp_up: int = 6
+    cleaning_cost: float = 15000.0
+    cleaning_frequency: int = 9
+    one_time_cost: float = 1000.0
+    crew_cost: float = 100.0
+    monthly_deterioration: float = 0.001
+    yearly_sub_increase: float = 0.10
+    ramp_up_saving_pct: float = 0.60
+    post_cleaning_saving_pct: float = 1.00
+
+    @property
+    def months(self):
+        return self.years * 12
+
+    @property
+    def total_saving_pct(self):
+        return self.saving_hull + self.saving_voyage + self.saving_emission + self.saving_scorecard + self.saving_propulsion
+
+    @property
+    def initial_sub_cost(self):
+        return sum([self.cost_hull, self.cost_voyage, self.cost_emission, self.cost_scorecard, self.cost_propulsion])
+
+
+class Projection(NamedTuple):
+    table: pd.DataFrame
+    total_fuel_mt: float
+
+
+class FleetProjection(NamedTuple):
+    table: pd.DataFrame
+    vessels: pd.DataFrame
+    total_fuel_mt: float
+
+
+# Per-vessel inputs that may differ across a fleet
+VESSEL_COLUMNS = ["daily_fuel", "op_days", "cleaning_frequency", "ramp_up"]
+# Per-vessel app mix: 1/True if the vessel subscribes to the app
+APPS = ["hull", "voyage", "emission", "scorecard", "propulsion"]
+APP_COLUMNS = [f"app_{a}" for a in APPS]
+FLEET_CHUNK_SIZE = 5_000
+
+
+def _col(x):
+    return np.asarray(x, dtype=float)[..., None]
+
+
+def _stage_nbytes(result):
+    return sum(a.nbytes for a in result.values())
+
+
+# Shared by every projection in the process; 0 turns stage caching off
+stage_cache = LRUCache(int(os.environ.get("ROI_STAGE_CACHE_BYTES", 32 * 1024 * 1024)), sizeof=_stage_nbytes)
+# Bytes of stage output per (run, month): eleven float arrays and the boolean cleaning mask
+STAGE_BYTES_PER_CELL = 11 * 8 + 1
+# Batches whose stage outputs would take more of the budget than this run uncached, so one
+# large fleet neither evicts every other entry nor pays to cache results it rarely repeats
+STAGE_BATCH_FRACTION = 0.25
+
+
+def _stage(cache, name, shape, inputs, upstream, compute):
+    """Run one stage through ``cache``. The key covers the stage's own inputs
+    and the keys of the stages it reads, so a changed input recomputes only the
+    stages downstream of it. Returns (key, result)."""
+    if cache is None:
+        return None, compute()
+    h = hashlib.blake2b(f"{name}{shape}".encode(), digest_size=16)
+    for x in inputs:
+        h.update(f"{x.shape}{x.dtype.char}".encode())
+        h.update(x.tobytes())
+    for k in upstream:
+        h.update(k)
+    key = h.digest()
+    result = cache.get(key)
+    if result is None:
+        result = compute()
+        # Later calls share these arrays
+        for a in result.values():
+            a.flags.writeable = False
+        cache.put(key, result)
+    return key, result
+
+
+def _fuel_stage(shape, new_year, fuel_price, daily_fuel, op_days, yearly_sub_increase):
+    # Yearly escalation as a running product, seeded with the month-1 value so the
+    # multiplications happen in the same order as compounding month by month.
+    fuel_steps = np.empty(shape)
+    fuel_steps[:] = np.where(new_year, 1 + yearly_sub_increase, 1.0)
+    fuel_steps[:, :1] = fuel_price * daily_fuel * op_days / 12
+    fuel_cost = np.cumprod(fuel_steps, axis=1)
+    return {"fuel_cost": fuel_cost, "fuel_mt": fuel_cost / fuel_price}
+
+
+def _schedule_stage(shape, month, total_saving_pct, ramp_up, cleaning_frequency, monthly_deterioration,
+                    ramp_up_saving_pct, post_cleaning_saving_pct, cleaning_schedule):
+    runs, months = shape
+    # Saving % schedule: before ramp-up, ramp-up plateau, cleaning reset, deterioration
+    pre_ramp = np.broadcast_to(month < ramp_up, shape)
+    if cleaning_schedule is None:
+        plateau = ~pre_ramp & (month > ramp_up) & (month < cleaning_frequency)
+        cleaning = np.broadcast_to((month % cleaning_frequency == 0) & (month >= ramp_up), shape)
+    else:
+        cleaning = np.broadcast_to(cleaning_schedule & (month >= ramp_up), shape)
+        first_clean = np.where(cleaning.any(axis=1), cleaning.argmax(axis=1) + 1, months + 1)[:, None]
+        plateau = ~pre_ramp & (month > ramp_up) & (month < first_clean)
+    deteriorating = ~(pre_ramp | plateau | cleaning)
+
+    # Deterioration steps since the last cleaning (or since the start if none yet)
+    steps_taken = np.cumsum(deteriorating, axis=1)
+    steps_since_clean = steps_taken - np.maximum.accumulate(np.where(cleaning, steps_taken, 0), axis=1)
+    cleaned_before = np.logical_or.accumulate(cleaning, axis=1)
+
+    decay = np.empty((runs, months + 1))
+    decay[:] = -(monthly_deterioration * 100)
+    decay[:, :1] = total_saving_pct * post_cleaning_saving_pct
+    after_clean = np.cumsum(decay, axis=1)
+    after_clean[:, 1:] = np.maximum(after_clean[:, 1:], 0)
+    decay[:, 0] = 0.0
+    never_cleaned = np.maximum(np.cumsum(decay, axis=1), 0)
+    last_saving_pct = np.where(cleaned_before,
+                               np.take_along_axis(after_clean, steps_since_clean, axis=1),
+                               np.take_along_axis(never_cleaned, steps_since_clean, axis=1))
+
+    saving_pct = np.where(pre_ramp, 0.0, np.where(plateau, total_saving_pct * ramp_up_saving_pct, last_saving_pct))
+    return {"saving_pct": saving_pct, "cleaning": np.ascontiguousarray(cleaning)}
+
+
+def _savings_stage(fuel_cost, saving_pct):
+    fuel_saving = fuel_cost * (saving_pct / 100)
+    return {"fuel_saving": fuel_saving, "cumulative_savings": np.cumsum(fuel_saving, axis=1)}
+
+
+def _cost_stage(shape, month, new_year, cleaning, initial_sub_cost, yearly_sub_increase, cleaning_cost,
+                one_time_cost, crew_cost):
+    sub_steps = np.empty(shape)
+    sub_steps[:] = np.where(new_year, 1 + yearly_sub_increase, 1.0)
+    sub_steps[:, :1] = initial_sub_cost
+    sub_cost = np.cumprod(sub_steps, axis=1)
+    hull_cleaning = np.where(cleaning, cleaning_cost, 0.0)
+    other_cost = np.where(month == 1, one_time_cost + crew_cost, 0.0)
+    return {
+        "sub_cost": sub_cost,
+        "cumulative_sub_cost": np.cumsum(sub_cost, axis=1),
+        "hull_cleaning": hull_cleaning,
+        "cumulative_total_cost": np.cumsum(sub_cost + hull_cleaning + other_cost, axis=1),
+    }
+
+
+def _returns_stage(cumulative_savings, cumulative_total_cost):
+    profit = cumulative_savings - cumulative_total_cost
+    with np.errstate(divide="ignore", invalid="ignore"):
+        roi = np.where(cumulative_total_cost > 0, profit / cumulative_total_cost, -1)
+    return {"profit": profit, "roi": roi}
+
+
+def project_batch(months, fuel_price, daily_fuel, op_days, total_saving_pct, initial_sub_cost,
+                  ramp_up, cleaning_cost, cleaning_frequency, one_time_cost, crew_cost,
+                  monthly_deterioration, yearly_sub_increase, ramp_up_saving_pct, post_cleaning_saving_pct,
+                  cleaning_schedule=None, stages: LRUCache = None):
+    """Project many runs at once. Every input except ``months`` may be a scalar or
+    a 1-D array with one value per run; results are (runs, months) arrays.
+
+    ``cleaning_schedule`` replaces the every-``cleaning_frequency``-months rule
+    with an explicit boolean (months,) or (runs, months) mask of cleaning months;
+    the ramp-up plateau then lasts until the first cleaning.
+
+    The projection runs as five stages: fuel cost, saving-% schedule, savings,
+    cost stack, and profit/ROI. With ``stages``, each stage is reused while
+    its inputs are unchanged; e.g. a new cleaning cost recomputes only the cost
+    stack and profit/ROI. Batches too large for a quarter of ``stages`` run
+    uncached. Results from ``stages`` are read-only."""
+    fuel_price, daily_fuel, op_days, total_saving_pct, initial_sub_cost, ramp_up, cleaning_cost, \
+        cleaning_frequency, one_time_cost, crew_cost, monthly_deterioration, yearly_sub_increase, \
+        ramp_up_saving_pct, post_cleaning_saving_pct = cols = [_col(x) for x in (
+            fuel_price, daily_fuel, op_days, total_saving_pct, initial_sub_cost, ramp_up, cleaning_cost,
+            cleaning_frequency, one_time_cost, crew_cost, monthly_deterioration, yearly_sub_increase,
+            ramp_up_saving_pct, post_cleaning_saving_pct)]
+    if cleaning_schedule is not None:
+        cleaning_schedule = np.asarray(cleaning_schedule, dtype=bool)
+        cols.append(np.empty(cleaning_schedule.shape[:-1] + (1,)))
+    runs = np.broadcast_shapes((1,), *(c.shape for c in cols))[0]
+    shape = (runs, months)
+    if stages is not None and runs * months * STAGE_BYTES_PER_CELL > stages.max_bytes * STAGE_BATCH_FRACTION:
+        stages = None
+
+    month = np.arange(1, months + 1)
+    new_year = (month % 12 == 1) & (month > 1)
+
+    fuel_key, fuel = _stage(
+        stages, "fuel", shape, (fuel_price, daily_fuel, op_days, yearly_sub_increase), (),
+        lambda: _fuel_stage(shape, new_year, fuel_price, daily_fuel, op_days, yearly_sub_increase))
+    schedule_inputs = (total_saving_pct, ramp_up, cleaning_frequency, monthly_deterioration, ramp_up_saving_pct,
+                       post_cleaning_saving_pct)
+    schedule_key, schedule = _stage(
+        stages, "schedule", shape,
+        schedule_inputs + (() if cleaning_schedule is None else (cleaning_schedule,)), (),
+        lambda: _schedule_stage(shape, month, *schedule_inputs, cleaning_schedule))
+    savings_key, savings = _stage(
+        stages, "savings", shape, (), (fuel_key, schedule_key),
+        lambda: _savings_stage(fuel["fuel_cost"], schedule["saving_pct"]))
+    cost_key, costs = _stage(
+        stages, "costs", shape, (initial_sub_cost, yearly_sub_increase, cleaning_cost, one_time_cost, crew_cost),
+        (schedule_key,),
+        lambda: _cost_stage(shape, month, new_year, schedule["cleaning"], initial_sub_cost, yearly_sub_increase,
+                            cleaning_cost, one_time_cost, crew_cost))
+    _, returns = _stage(
+        stages, "returns", shape, (), (savings_key, cost_key),
+        lambda: _returns_stage(savings["cumulative_savings"], costs["cumulative_total_cost"]))
+
+    return {
+        "fuel_cost": fuel["fuel_cost"],
+        "fuel_mt": fuel["fuel_mt"],
+        "sub_cost": costs["sub_cost"],
+        "cumulative_sub_cost": costs["cumulative_sub_cost"],
+        "hull_cleaning": costs["hull_cleaning"],
+        "saving_pct": schedule["saving_pct"],
+        "fuel_saving": savings["fuel_saving"],
+        "cumulative_savings": savings["cumulative_savings"],
+        "cumulative_total_cost": costs["cumulative_total_cost"],
+        "profit": returns["profit"],
+        "roi": returns["roi"],
+    }
+
+
+def batch_kwargs(p: ProjectionParams, **fields):
+    """``project_batch`` arguments for ``p``. ``fields`` override ``p`` and may be
+    per-run arrays (every field except ``years``)."""
+    if fields:
+        p = replace(p, **fields)
+    return dict(
+        months=p.months, fuel_price=p.fuel_price, daily_fuel=p.daily_fuel, op_days=p.op_days,
+        total_saving_pct=p.total_saving_pct, initial_sub_cost=p.initial_sub_cost, ramp_up=p.ramp_up,
+        cleaning_cost=p.cleaning_cost, cleaning_frequency=p.cleaning_frequency,
+        one_time_cost=p.one_time_cost, crew_cost=p.crew_cost,
+        monthly_deterioration=p.monthly_deterioration, yearly_sub_increase=p.yearly_sub_increase,
+        ramp_up_saving_pct=p.ramp_up_saving_pct, post_cleaning_saving_pct=p.post_cleaning_saving_pct)
+
+
+class ProjectionTable:
+    """Monthly projection stored as preallocated float64 columns. "Cumulative
+    ROI" is in percent; formatting is left to whatever displays the table.
+
+    All columns live in one (columns, rows) array, so ``to_frame()`` wraps it
+    in a DataFrame without copying and without building per-row objects."""
+    COLUMNS = [
+        "Month",
+        "Fuel Cost",
+        "Subscription Cost",
+        "Cumulative Subscription Cost",
+        "Hull Cleaning Cost",
+        "Savings in Fuel (%)",
+        "Fuel Cost Savings",
+        "Cumulative Savings",
+        "Cumulative Total Cost",
+        "Profit",
+        "Cumulative ROI",
+    ]
+
+    def __init__(self, rows):
+        self.values = np.empty((len(self.COLUMNS), rows))
+
+    def __len__(self):
+        return self.values.shape[1]
+
+    def __getitem__(self, name):
+        return self.values[self.COLUMNS.index(name)]
+
+    def __setitem__(self, name, values):
+        self.values[self.COLUMNS.index(name)] = values
+
+    def to_frame(self):
+        return pd.DataFrame(self.values.T, columns=self.COLUMNS, copy=False)
+
+
+def _table(fuel_cost, sub_cost, cumulative_sub_cost, hull_cleaning, saving_pct, fuel_saving,
+           cumulative_savings, cumulative_total_cost, profit, roi, month=None):
+    t = ProjectionTable(len(fuel_cost))
+    t["Month"] = np.arange(1, len(fuel_cost) + 1) if month is None else month
+    for name, values in [
+            ("Fuel Cost", fuel_cost),
+            ("Subscription Cost", sub_cost),
+            ("Cumulative Subscription Cost", cumulative_sub_cost),
+            ("Hull Cleaning Cost", hull_cleaning),
+            ("Fuel Cost Savings", fuel_saving),
+            ("Cumulative Savings", cumulative_savings),
+            ("Cumulative Total Cost", cumulative_total_cost),
+            ("Profit", profit)]:
+        np.rint(values, out=t[name])
+    np.round(saving_pct, 2, out=t["Savings in Fuel (%)"])
+    np.multiply(roi, 100, out=t["Cumulative ROI"])
+    return t.to_frame()
+
+
+def compute_projection(p: ProjectionParams) -> Projection:
+    """Month-by-month fuel savings, costs, profit and ROI for one vessel."""
+    r = {k: v[0] for k, v in project_batch(**batch_kwargs(p), stages=stage_cache).items()}
+    table = _table(r["fuel_cost"], r["sub_cost"], r["cumulative_sub_cost"], r["hull_cleaning"], r["saving_pct"],
+                   r["fuel_saving"], r["cumulative_savings"], r["cumulative_total_cost"], r["profit"], r["roi"])
+    return Projection(table, float(np.cumsum(r["fuel_mt"])[-1]))
+
+
+def default_fleet(p: ProjectionParams, fleet_size: int) -> pd.DataFrame:
+    """A fleet of identical vessels using the single-vessel inputs and every app."""
+    return pd.DataFrame({
+        "vessel": [f"Vessel {i}" for i in range(1, fleet_size + 1)],
+        **{c: np.repeat(getattr(p, c), fleet_size) for c in VESSEL_COLUMNS},
+        **{c: np.ones(fleet_size, dtype=bool) for c in APP_COLUMNS},
+    })
+
+
+def read_fleet_chunks(file, name: str, chunksize: int = FLEET_CHUNK_SIZE):
+    """Yield a CSV or Parquet vessel register in DataFrames of ``chunksize`` rows."""
+    if name.lower().endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(file).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif name.lower().endswith(".csv"):
+        yield from pd.read_csv(file, chunksize=chunksize)
+    else:
+        raise ValueError(f"Unsupported fleet file {name!r}: expected .csv or .parquet")
+
+
+def _vessel_kwargs(p: ProjectionParams, vessels: pd.DataFrame):
+    # Blank cells fall back to the dashboard inputs, and blank app flags to subscribed
+    kwargs = batch_kwargs(p)
+    for c in VESSEL_COLUMNS:
+        if c in vessels:
+            kwargs[c] = vessels[c].fillna(getattr(p, c)).to_numpy(dtype=float)
+    if np.any(np.asarray(kwargs["cleaning_frequency"]) < 1):
+        raise ValueError("cleaning_frequency must be at least 1 month for every vessel")
+    if any(c in vessels for c in APP_COLUMNS):
+        enabled = [vessels[c].fillna(1).to_numpy(dtype=float) if c in vessels else np.ones(len(vessels))
+                   for c in APP_COLUMNS]
+        savings = [getattr(p, f"saving_{a}") for a in APPS]
+        costs = [getattr(p, f"cost_{a}") for a in APPS]
+        kwargs["total_saving_pct"] = sum((s * e for s, e in zip(savings[1:], enabled[1:])), savings[0] * enabled[0])
+        kwargs["initial_sub_cost"] = sum(c * e for c, e in zip(costs, enabled))
+    return kwargs
+
+
+def _vessel_names(vessels, first):
+    if "vessel" in vessels:
+        return vessels["vessel"].to_numpy()
+    return np.array([f"Vessel {i}" for i in range(first, first + len(vessels))], dtype=object)
+
+
+def name_vessels(vessels: pd.DataFrame) -> pd.DataFrame:
+    """``vessels`` with a "vessel" column, so names survive filtering and paging."""
+    return vessels if "vessel" in vessels else vessels.assign(vessel=_vessel_names(vessels, 1))
+
+
+def _vessel_summary(vessels, kwargs, r, first):
+    n = len(vessels)
+    fuel_mt = np.cumsum(r["fuel_mt"], axis=1)[:, -1]
+    return pd.DataFrame({
+        "Vessel": _vessel_names(vessels, first),
+        "Daily Fuel (MT)": np.broadcast_to(kwargs["daily_fuel"], n),
+        "Operating Days": np.broadcast_to(kwargs["op_days"], n),
+        "Cleaning Frequency": np.broadcast_to(kwargs["cleaning_frequency"], n),
+        "Ramp-up Delay": np.broadcast_to(kwargs["ramp_up"], n),
+        "Total Saving (%)": np.round(np.broadcast_to(kwargs["total_saving_pct"], n), 2),
+        "Fuel Used (MT)": np.round(fuel_mt, 1),
+        "Cumulative Savings": np.rint(r["cumulative_savings"][:, -1]).astype(np.int64),
+        "Cumulative Total Cost": np.rint(r["cumulative_total_cost"][:, -1]).astype(np.int64),
+        "Profit": np.rint(r["profit"][:, -1]).astype(np.int64),
+        "Cumulative ROI": r["roi"][:, -1] * 100,
+    }), fuel_mt.sum()
+
+
+def project_fleet_chunks(p: ProjectionParams, chunks) -> FleetProjection:
+    """Project a fleet supplied as an iterable of vessel DataFrames (one row per
+    vessel, columns from ``VESSEL_COLUMNS``/``APP_COLUMNS`` overriding ``p``).
+
+    Only one chunk's (vessels, months) arrays are alive at a time; monthly fleet
+    totals are accumulated as each chunk is projected."""
+    fleet = None
+    summaries = []
+    total_fuel_mt = 0.0
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        kwargs = _vessel_kwargs(p, chunk)
+        r = project_batch(**kwargs, stages=stage_cache)
+        sums = {k: v.sum(axis=0) for k, v in r.items() if k not in ("saving_pct", "roi")}
+        fleet = sums if fleet is None else {k: fleet[k] + v for k, v in sums.items()}
+        summary, fuel_mt = _vessel_summary(chunk, kwargs, r, first=sum(map(len, summaries)) + 1)
+        summaries.append(summary)
+        total_fuel_mt += fuel_mt
+    if fleet is None:
+        raise ValueError("The fleet has no vessels")
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fleet["saving_pct"] = np.where(fleet["fuel_cost"] > 0, fleet["fuel_saving"] / fleet["fuel_cost"] * 100, 0.0)
+        fleet["roi"] = np.where(fleet["cumulative_total_cost"] > 0,
+                                fleet["profit"] / fleet["cumulative_total_cost"], -1)
+    table = _table(fleet["fuel_cost"], fleet["sub_cost"], fleet["cumulative_sub_cost"], fleet["hull_cleaning"],
+                   fleet["saving_pct"], fleet["fuel_saving"], fleet["cumulative_savings"],
+                   fleet["cumulative_total_cost"], fleet["profit"], fleet["roi"])
+    return FleetProjection(table, pd.concat(summaries, ignore_index=True), float(total_fuel_mt))
+
+
+def compute_fleet_projection(p: ProjectionParams, vessels: pd.DataFrame,
+                             chunksize: int = FLEET_CHUNK_SIZE) -> FleetProjection:
+    """Project every vessel in ``vessels`` and return fleet totals per month plus a
+    per-vessel summary at the end of the contract."""
+    return project_fleet_chunks(p, (vessels.iloc[i:i + chunksize] for i in range(0, max(len(vessels), 1), chunksize)))
+
+
+def batch_table(r, first_month: int = 1, last_month: int = None, rows: slice = slice(None)) -> pd.DataFrame:
+    """Long (run-major) monthly table of ``project_batch`` results, limited to
+    ``first_month..last_month`` and then to ``rows`` of that table."""
+    last_month = r["profit"].shape[1] if last_month is None else last_month
+    window = {k: v[:, first_month - 1:last_month].ravel()[rows] for k, v in r.items()}
+    month = np.tile(np.arange(first_month, last_month + 1), len(r["profit"]))[rows]
+    return _table(window["fuel_cost"], window["sub_cost"], window["cumulative_sub_cost"], window["hull_cleaning"],
+                  window["saving_pct"], window["fuel_saving"], window["cumulative_savings"],
+                  window["cumulative_total_cost"], window["profit"], window["roi"], month=month)
+
+
+def vessel_month_rows(p: ProjectionParams, vessels: pd.DataFrame, start: int, stop: int,
+                      first_month: int = 1, last_month: int = None) -> pd.DataFrame:
+    """Rows ``start:stop`` of the per-vessel monthly table (vessel-major, limited
+    to ``first_month..last_month``). Only the vessels on those rows are projected,
+    so a page costs the same however large the fleet is."""
+    last_month = p.months if last_month is None else last_month
+    span = last_month - first_month + 1
+    v0, v1 = start // span, (stop - 1) // span + 1
+    chunk = vessels.iloc[v0:v1]
+    if chunk.empty:
+        return pd.DataFrame(columns=["Vessel"] + ProjectionTable.COLUMNS)
+    r = project_batch(**_vessel_kwargs(p, chunk))
+    rows = slice(start - v0 * span, stop - v0 * span)
+    table = batch_table(r, first_month, last_month, rows)
+    table.insert(0, "Vessel", np.repeat(_vessel_names(chunk, v0 + 1), span)[rows])
+    return table
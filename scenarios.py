@@ -0,0 +1,197 @@
+from dataclasses import dataclass, replace
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+from projection import APPS, ProjectionParams, batch_kwargs, project_batch
+
+MC_CHUNK_SIZE = 10_000
+PERCENTILES = [10, 50, 90]
+
+
+# === Monte Carlo ===
+@dataclass(frozen=True)
+class Uncertainty:
+    """Spread of the uncertain inputs around the dashboard values. Relative
+    spreads are standard deviations in percent of the input (normal draws,
+    truncated at zero); ramp-up varies uniformly by whole months."""
+    draws: int = 10_000
+    fuel_price_pct: float = 20.0
+    saving_pct: float = 25.0
+    deterioration_pct: float = 50.0
+    ramp_up_months: int = 2
+    seed: int = 0
+
+
+class MonteCarloResult(NamedTuple):
+    bands: pd.DataFrame
+    final_profit: np.ndarray
+    final_roi: np.ndarray
+
+
+def _spread(rng, value, pct, n):
+    return np.maximum(rng.normal(value, abs(value) * pct / 100, n), 0)
+
+
+def sample_inputs(p: ProjectionParams, u: Uncertainty, n: int, rng) -> dict:
+    """``project_batch`` keyword arguments for ``n`` random draws around ``p``."""
+    kwargs = batch_kwargs(p)
+    savings = [_spread(rng, getattr(p, f"saving_{a}"), u.saving_pct, n) for a in APPS]
+    kwargs["fuel_price"] = _spread(rng, p.fuel_price, u.fuel_price_pct, n)
+    kwargs["total_saving_pct"] = sum(savings[1:], savings[0])
+    kwargs["monthly_deterioration"] = _spread(rng, p.monthly_deterioration, u.deterioration_pct, n)
+    kwargs["ramp_up"] = np.maximum(p.ramp_up + rng.integers(-u.ramp_up_months, u.ramp_up_months + 1, n), 0)
+    return kwargs
+
+
+def monte_carlo(p: ProjectionParams, u: Uncertainty, chunksize: int = MC_CHUNK_SIZE) -> MonteCarloResult:
+    """Project ``u.draws`` sampled scenarios as (draws, months) arrays, ``chunksize``
+    draws at a time, and summarize Profit and ROI as P10/P50/P90 bands per month."""
+    rng = np.random.default_rng(u.seed)
+    profit = np.empty((u.draws, p.months))
+    roi = np.empty((u.draws, p.months))
+    for start in range(0, u.draws, chunksize):
+        n = min(chunksize, u.draws - start)
+        r = project_batch(**sample_inputs(p, u, n, rng))
+        profit[start:start + n] = r["profit"]
+        roi[start:start + n] = r["roi"] * 100
+
+    profit_bands = np.percentile(profit, PERCENTILES, axis=0)
+    roi_bands = np.percentile(roi, PERCENTILES, axis=0)
+    bands = pd.DataFrame({
+        "Month": np.arange(1, p.months + 1),
+        **{f"Profit P{q}": b for q, b in zip(PERCENTILES, profit_bands)},
+        **{f"ROI P{q}": b for q, b in zip(PERCENTILES, roi_bands)},
+    })
+    return MonteCarloResult(bands, profit[:, -1].copy(), roi[:, -1].copy())
+
+
+# === Sensitivity ===
+SENSITIVITY_INPUTS = {
+    "fuel_price": "Fuel Price ($/MT)",
+    "daily_fuel": "Daily Fuel Consumption (MT)",
+    "op_days": "Operating Days per Year",
+    "saving_hull": "Hull & Performance Saving (%)",
+    "saving_voyage": "Voyage Optimization Saving (%)",
+    "saving_emission": "Emission Cost Avoidance (%)",
+    "saving_scorecard": "Scorecard Cost Avoidance (%)",
+    "saving_propulsion": "Propulsion Pro Saving (%)",
+    "cost_hull": "Hull App Cost ($)",
+    "cost_voyage": "Voyage App Cost ($)",
+    "cost_emission": "Emission App Cost ($)",
+    "cost_scorecard": "Scorecard App Cost ($)",
+    "cost_propulsion": "Propulsion Pro App Cost ($)",
+    "ramp_up": "Ramp-up Delay (Months)",
+    "cleaning_cost": "Hull Cleaning Cost ($)",
+    "cleaning_frequency": "Cleaning Frequency (Months)",
+    "one_time_cost": "One-time Cost ($)",
+    "crew_cost": "Crew Training Cost ($)",
+    "monthly_deterioration": "Monthly Deterioration (%)",
+    "yearly_sub_increase": "Yearly Subscription Increase (%)",
+    "ramp_up_saving_pct": "Post Ramp-up Saving % of Total",
+    "post_cleaning_saving_pct": "Post-Hull Cleaning Saving %",
+}
+# Month counts stay whole; cleaning needs at least one month between cleanings
+WHOLE_MONTHS = {"ramp_up": 0, "cleaning_frequency": 1}
+# Inputs stored as fractions but labelled in percent
+FRACTION_INPUTS = ["monthly_deterioration", "yearly_sub_increase", "ramp_up_saving_pct", "post_cleaning_saving_pct"]
+
+
+def sensitivity(p: ProjectionParams, pct: float = 10.0) -> pd.DataFrame:
+    """One-at-a-time sweep: move each input down and up by ``pct`` percent and
+    report final Profit and ROI. All 2 x inputs + 1 runs are projected together
+    in one batch, with the base case as run 0."""
+    names = list(SENSITIVITY_INPUTS)
+    base = np.array([float(getattr(p, n)) for n in names])
+    values = np.tile(base, (2 * len(names) + 1, 1))
+    for i, n in enumerate(names):
+        low, high = base[i] * (1 - pct / 100), base[i] * (1 + pct / 100)
+        if n in WHOLE_MONTHS:
+            low, high = max(round(low), WHOLE_MONTHS[n]), max(round(high), WHOLE_MONTHS[n])
+        values[1 + 2 * i, i], values[2 + 2 * i, i] = low, high
+
+    r = project_batch(**batch_kwargs(p, **dict(zip(names, values.T))))
+    profit, roi = r["profit"][:, -1], r["roi"][:, -1] * 100
+    lo, hi = slice(1, None, 2), slice(2, None, 2)
+    scale = np.array([100 if n in FRACTION_INPUTS else 1 for n in names])
+    result = pd.DataFrame({
+        "Parameter": list(SENSITIVITY_INPUTS.values()),
+        "Low Value": values[lo].diagonal() * scale,
+        "High Value": values[hi].diagonal() * scale,
+        "Profit Low": profit[lo],
+        "Profit High": profit[hi],
+        "ROI Low": roi[lo],
+        "ROI High": roi[hi],
+    })
+    result["Profit Swing"] = (result["Profit High"] - result["Profit Low"]).abs()
+    result["ROI Swing"] = (result["ROI High"] - result["ROI Low"]).abs()
+    result.attrs.update(base_profit=profit[0], base_roi=roi[0])
+    return result.sort_values("Profit Swing", ascending=False, ignore_index=True)
+
+
+# === Parameter grid ===
+GRID_INPUTS = {"total_saving_pct": "Total Saving (%)", **SENSITIVITY_INPUTS}
+GRID_CHUNK_SIZE = 10_000
+
+
+def _input_scale(name):
+    return 100 if name in FRACTION_INPUTS else 1
+
+
+def _swept_fields(name):
+    return [f"saving_{a}" for a in APPS] if name == "total_saving_pct" else [name]
+
+
+def grid_axes_overlap(x: str, y: str) -> bool:
+    """True if ``x`` and ``y`` set the same input, e.g. an app saving and the
+    total saving, which already includes it."""
+    return bool(set(_swept_fields(x)) & set(_swept_fields(y)))
+
+
+def default_grid_range(p: ProjectionParams, name: str):
+    """A starting (low, high) range around the current value, in dashboard units."""
+    value = p.total_saving_pct if name == "total_saving_pct" else getattr(p, name) * _input_scale(name)
+    if name in WHOLE_MONTHS:
+        return float(max(WHOLE_MONTHS[name], 1)), float(max(2 * value, 12))
+    if value == 0:
+        return 0.0, 1.0
+    return float(value * 0.5), float(value * 1.5)
+
+
+def grid_base(p: ProjectionParams, x: str, y: str) -> ProjectionParams:
+    """``p`` with the swept inputs reset to their defaults, so a grid can be cached
+    under the remaining parameters only."""
+    defaults = ProjectionParams()
+    return replace(p, **{f: getattr(defaults, f) for f in _swept_fields(x) + _swept_fields(y)})
+
+
+def parameter_grid(p: ProjectionParams, x: str, x_values, y: str, y_values, month: int = None) -> pd.DataFrame:
+    """Project every combination of ``x_values`` x ``y_values`` (in dashboard
+    units, see ``GRID_INPUTS``; month counts are rounded to whole months). Returns one row per combination with Profit at
+    ``month`` (default: end of contract) and final ROI, y-major."""
+    if grid_axes_overlap(x, y):
+        raise ValueError(f"grid axes {x} and {y} set the same input")
+    month = p.months if month is None else month
+    x_values, y_values = (np.asarray(v, dtype=float) for v in (x_values, y_values))
+    if x in WHOLE_MONTHS:
+        x_values = np.maximum(np.round(x_values), WHOLE_MONTHS[x])
+    if y in WHOLE_MONTHS:
+        y_values = np.maximum(np.round(y_values), WHOLE_MONTHS[y])
+    xs, ys = np.meshgrid(x_values, y_values)
+    xs, ys = xs.ravel(), ys.ravel()
+    profit = np.empty(len(xs))
+    roi = np.empty(len(xs))
+    for start in range(0, len(xs), GRID_CHUNK_SIZE):
+        part = slice(start, start + GRID_CHUNK_SIZE)
+        swept = {x: xs[part] / _input_scale(x), y: ys[part] / _input_scale(y)}
+        kwargs = batch_kwargs(p, **{k: v for k, v in swept.items() if k != "total_saving_pct"})
+        if "total_saving_pct" in swept:
+            kwargs["total_saving_pct"] = swept["total_saving_pct"]
+        r = project_batch(**kwargs)
+        profit[part] = r["profit"][:, month - 1]
+        roi[part] = r["roi"][:, -1] * 100
+
+    grid = pd.DataFrame({GRID_INPUTS[x]: xs, GRID_INPUTS[y]: ys, "Profit": profit, "ROI": roi})
+    grid.attrs.update(x=GRID_INPUTS[x], y=GRID_INPUTS[y], month=month, nx=len(x_values), ny=len(y_values))
+    return grid
@@ -0,0 +1,233 @@
+"""Results shared between sessions, worker processes and restarts.
+
+Within a process, st.cache_data and ``charts.render_cache`` already serve
+every session. Setting ``ROI_CACHE_DIR`` adds an on-disk tier below them: a
+SQLite database (WAL mode, so several ``streamlit run`` workers can share
+it) holding pickled projections and rendered chart bytes, evicted least
+recently used once it passes ``ROI_CACHE_DISK_BYTES`` (default 1 GiB).
+
+Keys are canonical hashes of the inputs, so equal parameters hit whichever
+session, worker or restart computed them first. The keys also include a
+hash of the engine and chart source plus the numpy, pandas and matplotlib
+versions, so a deploy never serves results from older code. Entries are
+pickles; keep the cache directory private to the dashboard.
+"""
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from importlib import metadata
+
+import numpy as np
+import pandas as pd
+
+DISK_CACHE_FILE = "results.sqlite"
+DEFAULT_DISK_BYTES = 1024 ** 3
+# Reads refresh an entry's LRU position at most this often, to keep reads from writing
+TOUCH_INTERVAL = 60.0
+
+
+def _code_version():
+    h = hashlib.blake2b(digest_size=8)
+    here = os.path.dirname(os.path.abspath(__file__))
+    for module in ["projection.py", "scenarios.py", "charts.py"]:
+        with open(os.path.join(here, module), "rb") as f:
+            h.update(f.read())
+    # Read from package metadata: importing matplotlib here would undo its lazy import in charts
+    h.update(f"{np.__version__}|{pd.__version__}|{metadata.version('matplotlib')}".encode())
+    return h.hexdigest()
+
+
+def _canonical(part):
+    if is_dataclass(part):
+        # 550 and 550.0 are the same parameter
+        fields = {k: float(v) if isinstance(v, (int, float, np.number)) and not isinstance(v, bool) else v
+                  for k, v in asdict(part).items()}
+        return f"{type(part).__name__}{json.dumps(fields, sort_keys=True)}".encode()
+    if isinstance(part, pd.DataFrame):
+        return (pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes()
+                + "|".join(f"{c}:{t}" for c, t in part.dtypes.items()).encode())
+    if isinstance(part, np.ndarray):
+        return f"{part.dtype.str}{part.shape}".encode() + np.ascontiguousarray(part).tobytes()
+    if isinstance(part, bytes):
+        return part
+    if hasattr(part, "getvalue"):  # uploaded files
+        return part.getvalue()
+    return repr(part).encode()
+
+
+def canonical_hash(*parts) -> str:
+    """Stable hex digest of ``parts`` (dataclasses, DataFrames, arrays, bytes, files or plain values)."""
+    h = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        data = _canonical(part)
+        h.update(len(data).to_bytes(8, "little"))
+        h.update(data)
+    return h.hexdigest()
+
+
+class LRUCache:
+    """Thread-safe in-memory LRU bounded by the total size of its values, as
+    measured by ``sizeof`` (``len``, for bytes). Values larger than the whole
+    budget are not stored."""
+
+    def __init__(self, max_bytes, sizeof=len):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    @property
+    def size(self):
+        return self._size
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            if key in self._entries:
+                self._size -= self._entries.pop(key)[1]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+
+class DiskCache:
+    """Size-bounded LRU of bytes in a SQLite file, safe to share between
+    threads and processes. Storage errors count as misses, never failures."""
+
+    def __init__(self, path, max_bytes=DEFAULT_DISK_BYTES, version=""):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.version = version
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute("CREATE TABLE IF NOT EXISTS entries "
+                       "(key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, accessed REAL NOT NULL)")
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed)")
+
+    def _connect(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get(self, key):
+        key = f"{self.version}:{key}"
+        try:
+            db = self._connect()
+            row = db.execute("SELECT value, accessed FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            now = time.time()
+            if now - row[1] > TOUCH_INTERVAL:
+                with db:
+                    db.execute("UPDATE entries SET accessed = ? WHERE key = ?", (now, key))
+            return row[0]
+        except sqlite3.Error:
+            return None
+
+    def put(self, key, data):
+        if len(data) > self.max_bytes:
+            return
+        try:
+            db = self._connect()
+            with db:
+                db.execute("INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?)",
+                           (f"{self.version}:{key}", data, len(data), time.time()))
+                excess = db.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0] - self.max_bytes
+                if excess > 0:
+                    evict = []
+                    for k, size in db.execute("SELECT key, size FROM entries ORDER BY accessed"):
+                        evict.append((k,))
+                        excess -= size
+                        if excess <= 0:
+                            break
+                    db.executemany("DELETE FROM entries WHERE key = ?", evict)
+        except sqlite3.Error:
+            pass
+
+
+class TieredCache:
+    """A process-local cache (an ``LRUCache`` or anything with ``get``/``put``,
+    or None) in front of an optional ``DiskCache``; disk hits are copied into the local tier."""
+
+    def __init__(self, memory=None, disk=None):
+        self.memory = memory
+        self.disk = disk
+
+    @staticmethod
+    def _disk_key(key):
+        return key if isinstance(key, str) else "|".join(map(str, key))
+
+    def get(self, key):
+        data = self.memory.get(key) if self.memory is not None else None
+        if data is None and self.disk is not None:
+            data = self.disk.get(self._disk_key(key))
+            if data is not None and self.memory is not None:
+                self.memory.put(key, data)
+        return data
+
+    def put(self, key, data):
+        if self.memory is not None:
+            self.memory.put(key, data)
+        if self.disk is not None:
+            self.disk.put(self._disk_key(key), data)
+
+
+def _disk_cache_from_env():
+    directory = os.environ.get("ROI_CACHE_DIR")
+    if not directory:
+        return None
+    os.makedirs(directory, exist_ok=True)
+    return DiskCache(os.path.join(directory, DISK_CACHE_FILE),
+                     int(os.environ.get("ROI_CACHE_DISK_BYTES", DEFAULT_DISK_BYTES)), _code_version())
+
+
+disk_cache = _disk_cache_from_env()
+
+
+def shared_result(name, fn, *args, cache=None):
+    """``fn(*args)``, shared through the disk tier under the canonical hash of
+    (``name``, ``args``); calls ``fn`` directly when there is no disk tier."""
+    cache = disk_cache if cache is None else cache
+    if cache is None:
+        return fn(*args)
+    key = f"{name}:{canonical_hash(*args)}"
+    data = cache.get(key)
+    if data is not None:
+        return pickle.loads(data)
+    result = fn(*args)
+    cache.put(key, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+    return result
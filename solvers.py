@@ -0,0 +1,135 @@
+from typing import NamedTuple
+
+import numpy as np
+
+from projection import ProjectionParams, batch_kwargs, project_batch
+
+
+# === Cleaning schedule ===
+class CleaningPlan(NamedTuple):
+    months: tuple
+    profit: float
+    baseline_months: tuple
+    baseline_profit: float
+
+
+def schedule_profit(p: ProjectionParams, cleaning_months, months: int = None) -> np.ndarray:
+    """Cumulative profit per month when the hull is cleaned in ``cleaning_months``."""
+    kwargs = batch_kwargs(p)
+    kwargs["months"] = months = p.months if months is None else months
+    mask = np.zeros(months, dtype=bool)
+    mask[np.asarray(cleaning_months, dtype=int) - 1] = True
+    return project_batch(**kwargs, cleaning_schedule=mask)["profit"][0]
+
+
+def optimal_cleaning_schedule(p: ProjectionParams, months: int = None) -> CleaningPlan:
+    """Cleaning months that maximize cumulative profit over ``months`` (default:
+    the contract), any set of months on or after ramp-up allowed.
+
+    Subscription and one-off costs do not depend on the schedule, so this
+    maximizes fuel savings minus cleaning costs by dynamic programming over
+    (month, months since last cleaning): O(months^2) work, one vectorized step
+    per month. Savings after a cleaning depend only on the months since it, so
+    this is exact for any deterioration, including negative."""
+    kwargs = batch_kwargs(p)
+    kwargs["months"] = months = p.months if months is None else months
+    fuel = project_batch(**kwargs)["fuel_cost"][0] / 100
+
+    clean_pct = p.total_saving_pct * p.post_cleaning_saving_pct
+    plateau_pct = p.total_saving_pct * p.ramp_up_saving_pct
+    decay = np.full(months + 1, -(p.monthly_deterioration * 100))
+    decay[0] = clean_pct
+    after_clean = np.cumsum(decay)
+    after_clean[1:] = np.maximum(after_clean[1:], 0)
+
+    # value[k]: best savings so far with the last cleaning k months ago;
+    # never_cleaned: savings so far with no cleaning yet
+    value = np.full(months + 1, -np.inf)
+    never_cleaned = 0.0
+    # cleaned_after[m - 1]: state before a cleaning in month m (-1 = never cleaned)
+    cleaned_after = np.full(months, -1)
+    for m in range(1, months + 1):
+        step = np.full(months + 1, -np.inf)
+        step[1:] = value[:-1] + fuel[m - 1] * after_clean[1:]
+        if m >= p.ramp_up:
+            k = int(np.argmax(value))
+            best = value[k]
+            if never_cleaned >= best:
+                best, k = never_cleaned, -1
+            step[0] = best + fuel[m - 1] * clean_pct - p.cleaning_cost
+            cleaned_after[m - 1] = k
+        if m > p.ramp_up:
+            never_cleaned += fuel[m - 1] * plateau_pct
+        value = step
+
+    schedule = []
+    k = int(np.argmax(value))
+    if value[k] > never_cleaned:
+        m = months - k
+        while True:
+            schedule.append(m)
+            k = int(cleaned_after[m - 1])
+            if k < 0:
+                break
+            m = m - 1 - k
+    schedule = tuple(sorted(schedule))
+
+    baseline = tuple(m for m in range(1, months + 1) if m % p.cleaning_frequency == 0 and m >= p.ramp_up)
+    return CleaningPlan(schedule, float(schedule_profit(p, schedule, months)[-1]),
+                        baseline, float(schedule_profit(p, baseline, months)[-1]))
+
+
+# === Break-even ===
+BISECTION_POINTS = 64
+
+
+def first_break_even(profit):
+    """First month (1-based) whose cumulative profit is >= 0, or None."""
+    reached = np.asarray(profit) >= 0
+    return int(reached.argmax()) + 1 if reached.any() else None
+
+
+def break_even_month(p: ProjectionParams):
+    return first_break_even(project_batch(**batch_kwargs(p))["profit"][0])
+
+
+def max_subscription_cost(p: ProjectionParams, by_month: int = None):
+    """Largest month-1 subscription cost (all apps together) that still breaks
+    even by ``by_month``, i.e. has ``first_break_even`` at or before it. Profit
+    in each month is linear in that cost, so two runs give every month's limit
+    in closed form and the answer is the largest of them; None if the vessel
+    can't break even even for free."""
+    by_month = p.months if by_month is None else by_month
+    kwargs = batch_kwargs(p)
+    kwargs["initial_sub_cost"] = np.array([0.0, 1.0])
+    free, per_dollar = project_batch(**kwargs)["profit"][:, :by_month]
+    reachable = free >= 0
+    if not reachable.any():
+        return None
+    return float((free[reachable] / (free[reachable] - per_dollar[reachable])).max())
+
+
+def required_saving_pct(p: ProjectionParams, by_month: int = None, tol: float = 1e-6, limit: float = 100.0):
+    """Smallest total saving % (sum of the five apps) that breaks even by
+    ``by_month`` (``first_break_even`` at or before it), or None if even
+    ``limit`` % doesn't.
+
+    Profit never falls as savings rise, so neither does its best month up to
+    ``by_month``, and the root is bracketed by evaluating
+    ``BISECTION_POINTS`` candidates in one batch and narrowing to the first
+    interval that crosses zero; each round shrinks the bracket 63-fold."""
+    by_month = p.months if by_month is None else by_month
+    kwargs = batch_kwargs(p)
+    lo, hi = 0.0, limit
+    while True:
+        candidates = np.linspace(lo, hi, BISECTION_POINTS)
+        kwargs["total_saving_pct"] = candidates
+        profit = project_batch(**kwargs)["profit"][:, :by_month].max(axis=1)
+        if profit[0] >= 0:
+            return float(candidates[0])
+        if profit[-1] < 0:
+            return None
+        i = int(np.argmax(profit >= 0))
+        lo, hi = candidates[i - 1], candidates[i]
+        if hi - lo <= tol:
+            return float(hi)
@@ -0,0 +1,28 @@
+import numpy as np
+
+# Styler keeps per-cell state, so past this size tables use native grid formatting without sign colours
+STYLED_ROW_LIMIT = 1_000
+WHOLE = ("{:,.0f}", "%.0f")
+TABLE_FORMATS = {  # column: (Styler format, st.column_config format)
+    **dict.fromkeys(["Month", "Fuel Cost", "Subscription Cost", "Cumulative Subscription Cost", "Hull Cleaning Cost",
+                     "Fuel Cost Savings", "Cumulative Savings", "Cumulative Total Cost", "Profit"], WHOLE),
+    "Savings in Fuel (%)": ("{:.2f}", "%.2f"),
+    "Total Saving (%)": ("{:.2f}", "%.2f"),
+    "Fuel Used (MT)": ("{:,.1f}", "%.1f"),
+    "Cumulative ROI": ("{:.1f}%", "%.1f%%"),
+}
+
+
+def highlight_sign(col): return np.where(col > 0, 'color: green;', 'color: red;')
+
+
+def table_formats(table):
+    return {c: f for c, f in TABLE_FORMATS.items() if c in table}
+
+
+def style_table(table):
+    """Styler with number formats and green/red Profit and ROI."""
+    styler = table.style.apply(highlight_sign, subset=[c for c in ["Profit", "Cumulative ROI"] if c in table])
+    for c, (styler_fmt, _) in table_formats(table).items():
+        styler = styler.format(styler_fmt, subset=[c])
+    return styler
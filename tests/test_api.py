@@ -0,0 +1,43 @@
+import asyncio
+import json
+
+import pytest
+
+import api
+
+
+def post(body: bytes):
+    sent = {}
+
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message):
+        sent.setdefault(message["type"], message)
+
+    asyncio.run(api.app({"type": "http", "method": "POST", "path": "/projection"}, receive, send))
+    return sent["http.response.start"]["status"], sent["http.response.body"]["body"]
+
+
+def test_projection_returns_strict_json():
+    status, body = post(b'{"fuel_price": 600, "years": 2}')
+    assert status == 200
+    result = json.loads(body, parse_constant=lambda c: pytest.fail(f"non-standard JSON constant {c}"))
+    assert len(result["monthly"]["data"]) == 24
+
+
+@pytest.mark.parametrize("body", [
+    b'{"fuel_price": 0}',
+    b'{"fuel_price": NaN}',
+    b'{"daily_fuel": Infinity}',
+    b'{"cleaning_frequency": 0}',
+    b'{"fuel_price": "550"}',
+    b'{"op_days": true}',
+    b'{"years": 2.5}',
+    b'{"years": 0}',
+    b'{"fuel_price": 1' + b'0' * 400 + b'}',
+])
+def test_invalid_parameters_are_rejected(body):
+    status, payload = post(body)
+    assert status == 400
+    assert "error" in json.loads(payload)
@@ -0,0 +1,36 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from batch import project_scenarios, read_scenarios
+from projection import ProjectionParams, compute_projection
+
+
+def test_yaml_items_with_different_fields_use_defaults(tmp_path):
+    path = tmp_path / "scenarios.yaml"
+    path.write_text("- {scenario: a, fuel_price: 600}\n"
+                    "- {scenario: b, cleaning_cost: 5000, years: 2}\n"
+                    "- {scenario: c}\n")
+    result = project_scenarios(pd.concat(read_scenarios(str(path))), summary=True)
+
+    assert list(result["Scenario"]) == ["a", "b", "c"]
+    assert np.isfinite(result.drop(columns="Scenario").to_numpy(dtype=float)).all()
+    for params, row in zip([ProjectionParams(fuel_price=600.0),
+                            ProjectionParams(cleaning_cost=5000.0, years=2),
+                            ProjectionParams()], result.itertuples()):
+        expected = compute_projection(params).table.iloc[-1]
+        assert row.Profit == expected["Profit"]
+        assert row.Month == expected["Month"]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("cleaning_frequency", 0, "cleaning_frequency"),
+    ("years", 0, "years"),
+    ("years", 2.5, "years"),
+    ("fuel_price", -1, "fuel_price"),
+    ("daily_fuel", float("inf"), "finite"),
+])
+def test_invalid_scenarios_are_rejected_by_name(field, value, message):
+    scenarios = pd.DataFrame({"scenario": ["ok", "bad"], field: [getattr(ProjectionParams(), field), value]})
+    with pytest.raises(ValueError, match=f"'bad'.*{message}"):
+        project_scenarios(scenarios)
@@ -0,0 +1,35 @@
+import gc
+import os
+import sys
+
+import pytest
+
+from charts import render_chart
+from projection import ProjectionParams, compute_projection
+
+RENDERS = 300
+MAX_RSS_GROWTH = 20 * 1024 * 1024
+
+
+def _rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="reads RSS from /proc")
+def test_repeated_renders_do_not_leak():
+    df = compute_projection(ProjectionParams()).table
+    kinds = ["trends", "roi", "totals"]
+    # Warm up fonts, styles and the smoothing basis before taking the baseline
+    for kind in kinds * 5:
+        render_chart(kind, df, dpi=50)
+    gc.collect()
+    before = _rss_bytes()
+
+    for i in range(RENDERS):
+        render_chart(kinds[i % len(kinds)], df, theme=["light", "dark"][i % 2], dpi=50)
+    gc.collect()
+
+    import matplotlib.pyplot as plt
+    assert plt.get_fignums() == []
+    assert _rss_bytes() - before < MAX_RSS_GROWTH
@@ -0,0 +1,23 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from projection import ProjectionParams, compute_fleet_projection, project_fleet_chunks, read_fleet_chunks
+
+
+def test_blank_register_cells_fall_back_to_inputs():
+    p = ProjectionParams()
+    register = "vessel,daily_fuel,op_days,app_hull\nA,,250,\nB,30,,False\n"
+    got = project_fleet_chunks(p, read_fleet_chunks(io.StringIO(register), "fleet.csv"))
+    filled = pd.DataFrame({"vessel": ["A", "B"], "daily_fuel": [20.0, 30.0], "op_days": [250.0, 200.0],
+                           "app_hull": [True, False]})
+    assert np.isfinite(got.table.to_numpy()).all()
+    pd.testing.assert_frame_equal(got.table, compute_fleet_projection(p, filled).table)
+
+
+def test_cleaning_frequency_below_one_month_is_rejected():
+    vessels = pd.DataFrame({"vessel": ["A", "B"], "cleaning_frequency": [0, 9]})
+    with pytest.raises(ValueError, match="cleaning_frequency"):
+        compute_fleet_projection(ProjectionParams(), vessels)
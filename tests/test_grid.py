@@ -0,0 +1,12 @@
+import pytest
+
+from projection import ProjectionParams
+from scenarios import grid_axes_overlap, parameter_grid
+
+
+def test_app_saving_and_total_saving_are_not_independent_axes():
+    assert grid_axes_overlap("saving_hull", "total_saving_pct")
+    assert grid_axes_overlap("total_saving_pct", "total_saving_pct")
+    assert not grid_axes_overlap("saving_hull", "cleaning_frequency")
+    with pytest.raises(ValueError, match="same input"):
+        parameter_grid(ProjectionParams(), "saving_hull", [1, 2], "total_saving_pct", [5, 10])
@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Seconds for all four modules: about 0.4 s, mostly numpy and pandas; with matplotlib and scipy loaded too it is about 1.4 s
+IMPORT_BUDGET = 1.0
+
+
+def _import_times(code, env=None):
+    """{module: self seconds} from ``python -X importtime -c code``."""
+    out = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True, env=env).stderr
+    times = {}
+    for line in out.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(self_us) / 1e6
+    return times
+
+
+@pytest.mark.parametrize("disk_cache", [False, True])
+def test_engine_imports_without_plotting_libraries(disk_cache, tmp_path):
+    env = {**os.environ, "ROI_CACHE_DIR": str(tmp_path)} if disk_cache else None
+    times = _import_times("import projection, charts, scenarios, solvers", env)
+    loaded = {name.split(".")[0] for name in times}
+    assert "matplotlib" not in loaded
+    assert "scipy" not in loaded
+    assert sum(times.values()) < IMPORT_BUDGET
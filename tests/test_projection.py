@@ -0,0 +1,72 @@
+import random
+
+import numpy as np
+import pytest
+
+from projection import ProjectionParams, compute_projection
+
+
+def reference_projection(p):
+    """The dashboard's original month-by-month loop: (rows, total fuel MT)."""
+    fuel_cost = p.fuel_price * p.daily_fuel * p.op_days / 12
+    sub_cost = p.initial_sub_cost
+    cumulative_sub_cost = cumulative_savings = cumulative_total_cost = total_fuel_mt = 0
+    last_saving_pct = 0
+    rows = []
+    for month in range(1, p.months + 1):
+        if month % 12 == 1 and month > 1:
+            fuel_cost *= (1 + p.yearly_sub_increase)
+            sub_cost *= (1 + p.yearly_sub_increase)
+        cleaning = month % p.cleaning_frequency == 0 and month >= p.ramp_up
+        if month < p.ramp_up:
+            saving_pct = 0
+        elif p.ramp_up < month < p.cleaning_frequency:
+            saving_pct = p.total_saving_pct * p.ramp_up_saving_pct
+        elif cleaning:
+            saving_pct = last_saving_pct = p.total_saving_pct * p.post_cleaning_saving_pct
+        else:
+            saving_pct = last_saving_pct = max(0, last_saving_pct - p.monthly_deterioration * 100)
+        fuel_saving = fuel_cost * (saving_pct / 100)
+        total_fuel_mt += fuel_cost / p.fuel_price
+        cumulative_savings += fuel_saving
+        cumulative_sub_cost += sub_cost
+        hull_cleaning = p.cleaning_cost if cleaning else 0
+        cumulative_total_cost += sub_cost + hull_cleaning + (p.one_time_cost + p.crew_cost if month == 1 else 0)
+        profit = cumulative_savings - cumulative_total_cost
+        roi = profit / cumulative_total_cost if cumulative_total_cost > 0 else -1
+        rows.append([month, round(fuel_cost), round(sub_cost), round(cumulative_sub_cost), round(hull_cleaning),
+                     round(saving_pct, 2), round(fuel_saving), round(cumulative_savings),
+                     round(cumulative_total_cost), round(profit), roi * 100])
+    return rows, total_fuel_mt
+
+
+def random_params(rng):
+    savings = np.arange(0, 6, 0.1)
+    return ProjectionParams(
+        years=rng.randint(1, 5), fuel_price=rng.uniform(100, 900), daily_fuel=rng.uniform(1, 60),
+        op_days=rng.randint(100, 365), **{f"saving_{a}": rng.choice(savings) for a in
+                                          ["hull", "voyage", "emission", "scorecard", "propulsion"]},
+        cost_hull=rng.uniform(0, 500), cost_voyage=rng.uniform(0, 500), ramp_up=rng.randint(-3, 30),
+        cleaning_cost=rng.uniform(0, 30000), cleaning_frequency=rng.randint(1, 30),
+        one_time_cost=rng.uniform(0, 5000), monthly_deterioration=rng.choice([0.0, 0.001, rng.uniform(0, 0.01)]),
+        yearly_sub_increase=rng.uniform(0, 0.2), ramp_up_saving_pct=rng.uniform(0, 1),
+        post_cleaning_saving_pct=rng.uniform(0, 1.2))
+
+
+EDGE_CASES = [
+    ProjectionParams(),
+    ProjectionParams(years=1),
+    ProjectionParams(ramp_up=12, cleaning_frequency=6),
+    ProjectionParams(ramp_up=9, cleaning_frequency=9),
+    ProjectionParams(ramp_up=-2),
+    ProjectionParams(cleaning_frequency=1, monthly_deterioration=0.05),
+]
+
+
+@pytest.mark.parametrize("p", EDGE_CASES + [random_params(random.Random(seed)) for seed in range(200)])
+def test_matches_the_original_loop(p):
+    rows, total_fuel_mt = reference_projection(p)
+    # The second run is served from the stage cache
+    for got in [compute_projection(p), compute_projection(p)]:
+        np.testing.assert_array_equal(got.table.to_numpy(), np.array(rows, dtype=float))
+        assert got.total_fuel_mt == total_fuel_mt
@@ -0,0 +1,72 @@
+import random
+from dataclasses import replace
+
+import numpy as np
+import pytest
+
+from projection import ProjectionParams, batch_kwargs, project_batch
+from solvers import break_even_month, max_subscription_cost, optimal_cleaning_schedule, required_saving_pct
+
+SCHEDULE_MONTHS = 10
+APP_FIELDS = ["hull", "voyage", "emission", "scorecard", "propulsion"]
+
+
+def best_schedule_profit(p, months):
+    """Highest final profit over every allowed cleaning schedule, by brute force."""
+    schedules = ((np.arange(2 ** months)[:, None] >> np.arange(months)) & 1).astype(bool)
+    schedules = schedules[~(schedules & (np.arange(1, months + 1) < p.ramp_up)).any(axis=1)]
+    kwargs = batch_kwargs(p)
+    kwargs["months"] = months
+    return project_batch(**kwargs, cleaning_schedule=schedules)["profit"][:, -1].max()
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_cleaning_schedule_matches_brute_force(seed):
+    rng = random.Random(seed)
+    # Negative deterioration (savings growing between cleanings) included
+    p = ProjectionParams(ramp_up=rng.randint(-1, 6), cleaning_cost=rng.uniform(0, 20_000),
+                         monthly_deterioration=rng.uniform(-0.01, 0.02), ramp_up_saving_pct=rng.uniform(0, 1),
+                         post_cleaning_saving_pct=rng.uniform(0, 1.2))
+    plan = optimal_cleaning_schedule(p, SCHEDULE_MONTHS)
+    assert plan.profit == pytest.approx(best_schedule_profit(p, SCHEDULE_MONTHS), rel=1e-9, abs=1e-6)
+
+
+def with_total_saving(p, pct):
+    return replace(p, **{f"saving_{a}": pct if a == "hull" else 0.0 for a in APP_FIELDS})
+
+
+def with_app_cost(p, cost):
+    return replace(p, **{f"cost_{a}": cost if a == "hull" else 0.0 for a in APP_FIELDS})
+
+
+def breaks_even_by(p, month):
+    reached = break_even_month(p)
+    return reached is not None and reached <= month
+
+
+def test_break_even_solvers_agree_with_the_kpi():
+    # Break-even month 35 of 36, though profit dips below zero again at a cleaning in month 36
+    p = with_total_saving(ProjectionParams(), 1.85)
+    assert break_even_month(p) == 35
+    assert required_saving_pct(p) <= 1.85
+    assert max_subscription_cost(p) >= p.initial_sub_cost
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_break_even_solvers_match_first_break_even(seed):
+    rng = random.Random(seed)
+    p = ProjectionParams(years=rng.randint(1, 5), ramp_up=rng.randint(0, 6), cleaning_frequency=rng.randint(1, 12),
+                         cleaning_cost=rng.uniform(0, 20_000), monthly_deterioration=rng.uniform(0, 0.01),
+                         saving_hull=rng.uniform(0, 3), saving_voyage=rng.uniform(0, 3))
+    by_month = rng.randint(1, p.months)
+
+    pct = required_saving_pct(p, by_month)
+    if pct is not None:
+        assert breaks_even_by(with_total_saving(p, pct), by_month)
+        if pct > 1e-4:
+            assert not breaks_even_by(with_total_saving(p, pct - 1e-4), by_month)
+
+    cost = max_subscription_cost(p, by_month)
+    if cost is not None:
+        assert breaks_even_by(with_app_cost(p, cost * (1 - 1e-9)), by_month)
+        assert not breaks_even_by(with_app_cost(p, cost * (1 + 1e-6) + 1e-3), by_month)
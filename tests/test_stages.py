@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+from projection import ProjectionParams, batch_kwargs, project_batch
+from sharedcache import LRUCache
+
+
+def _nbytes(result):
+    return sum(a.nbytes for a in result.values())
+
+
+def test_cached_stages_match_a_full_projection():
+    stages = LRUCache(32 * 1024 * 1024, sizeof=_nbytes)
+    kwargs = batch_kwargs(ProjectionParams())
+    project_batch(**kwargs, stages=stages)
+    kwargs["cleaning_cost"] = 20_000.0
+    got = project_batch(**kwargs, stages=stages)
+    assert stages.hits == 3  # fuel, schedule and savings are reused
+    for k, v in project_batch(**kwargs).items():
+        np.testing.assert_array_equal(got[k], v)
+    with pytest.raises(ValueError):
+        got["profit"][0, 0] = 0
+
+
+def test_batches_too_large_for_the_budget_are_not_cached():
+    stages = LRUCache(1024 * 1024, sizeof=_nbytes)
+    kwargs = batch_kwargs(ProjectionParams())
+    kwargs["daily_fuel"] = np.full(1_000, 20.0)
+    project_batch(**kwargs, stages=stages)
+    assert len(stages) == 0 and stages.misses == 0
@@ -0,0 +1,15 @@
+import socket
+
+import timing
+
+
+def test_metrics_port_in_use_is_logged_once(monkeypatch, caplog):
+    monkeypatch.setattr(timing, "_server", None)
+    monkeypatch.setattr(timing, "_server_failed", False)
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        assert timing.start_metrics_server(port, "127.0.0.1") is None
+        assert timing.start_metrics_server(port, "127.0.0.1") is None
+    assert len([r for r in caplog.records if "Metrics server not started" in r.message]) == 1
@@ -0,0 +1,123 @@
+"""Per-phase timing of dashboard reruns.
+
+The script calls ``RerunTimer.lap`` at the end of each section and hands the
+timer to ``stats.record`` when it finishes. ``stats`` is shared by every
+session in the process and keeps the last ``HISTORY`` samples of each phase
+for p50/p95. Each rerun is also logged as one JSON line on the ``roi.timing``
+logger (to stderr when ``ROI_TIMING_LOG`` is set), and ``start_metrics_server``
+serves the same figures as Prometheus text at ``/metrics``.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+HISTORY = 1_000
+QUANTILES = [50, 95]
+
+logger = logging.getLogger("roi.timing")
+if os.environ.get("ROI_TIMING_LOG") and not logger.handlers:
+    logger.addHandler(logging.StreamHandler())
+    logger.setLevel(logging.INFO)
+
+
+class RerunTimer:
+    """Split one script run into phases: ``lap(name)`` charges the time since
+    the previous lap (or the start) to ``name``."""
+
+    def __init__(self):
+        self.start = self._last = time.perf_counter()
+        self.phases = {}
+
+    def lap(self, name):
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0.0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self):
+        return self._last - self.start
+
+
+class TimingStats:
+    """Thread-safe rolling window of phase durations (seconds) across reruns,
+    plus lifetime counts and sums for Prometheus summaries."""
+
+    def __init__(self, history=HISTORY):
+        self.history = history
+        self._samples = {}
+        self._count = {}
+        self._sum = {}
+        self._lock = threading.Lock()
+
+    def record(self, timer: RerunTimer):
+        phases = {**timer.phases, "total": timer.total}
+        with self._lock:
+            for name, seconds in phases.items():
+                self._samples.setdefault(name, deque(maxlen=self.history)).append(seconds)
+                self._count[name] = self._count.get(name, 0) + 1
+                self._sum[name] = self._sum.get(name, 0.0) + seconds
+        logger.info(json.dumps({"event": "rerun", **{f"{k}_ms": round(v * 1000, 3) for k, v in phases.items()}}))
+
+    def summary(self) -> dict:
+        """{phase: {"count", "sum", "p50", "p95"}} in seconds, phases in first-seen order."""
+        with self._lock:
+            samples = {name: np.array(s) for name, s in self._samples.items()}
+            counts, sums = dict(self._count), dict(self._sum)
+        return {name: {"count": counts[name], "sum": sums[name],
+                       **{f"p{q}": v for q, v in zip(QUANTILES, np.percentile(s, QUANTILES))}}
+                for name, s in samples.items()}
+
+    def prometheus_text(self) -> str:
+        lines = ["# HELP roi_rerun_phase_seconds Time spent in each phase of a dashboard rerun.",
+                 "# TYPE roi_rerun_phase_seconds summary"]
+        for name, s in self.summary().items():
+            for q in QUANTILES:
+                lines.append(f'roi_rerun_phase_seconds{{phase="{name}",quantile="{q / 100}"}} {s[f"p{q}"]:.6f}')
+            lines.append(f'roi_rerun_phase_seconds_sum{{phase="{name}"}} {s["sum"]:.6f}')
+            lines.append(f'roi_rerun_phase_seconds_count{{phase="{name}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+stats = TimingStats()
+
+_server = None
+_server_failed = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="0.0.0.0", timing_stats=stats):
+    """Serve ``timing_stats`` as Prometheus text on a daemon thread; later calls
+    return the already running server. If the port can't be bound (e.g. another
+    worker process already serves it) this logs a warning once and returns None."""
+    global _server, _server_failed
+    with _server_lock:
+        if _server is None and not _server_failed:
+            class Handler(BaseHTTPRequestHandler):
+                def do_GET(self):
+                    if self.path != "/metrics":
+                        self.send_error(404)
+                        return
+                    body = timing_stats.prometheus_text().encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/plain; version=0.0.4")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            try:
+                _server = ThreadingHTTPServer((host, port), Handler)
+            except OSError as e:
+                _server_failed = True
+                logger.warning("Metrics server not started on %s:%s: %s", host, port, e)
+                return None
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server